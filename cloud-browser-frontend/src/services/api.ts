@@ -4,6 +4,7 @@ import {
   ApiResponse, 
   ApiError, 
   PaginatedResponse,
+  CursorPaginatedResponse,
   HealthStatus,
   SystemMetrics,
   AdminStats,
@@ -232,10 +233,10 @@ export const healthApi = {
 // Admin API
 export const adminApi = {
   getUsers: (params?: {
-    page?: number
+    cursor?: string
     per_page?: number
     search?: string
-  }): Promise<AxiosResponse<ApiResponse<PaginatedResponse<User>>>> =>
+  }): Promise<AxiosResponse<ApiResponse<CursorPaginatedResponse<User>>>> =>
     api.get('/admin/users', { params }),
     
   getUser: (userId: number): Promise<AxiosResponse<ApiResponse<{ user: User; statistics: any; sessions: BrowserSession[] }>>> =>
@@ -30,6 +30,17 @@ export interface PaginatedResponse<T> {
   }
 }
 
+export interface CursorPaginatedResponse<T> {
+  items: T[]
+  pagination: {
+    per_page: number
+    cursor: string | null
+    next_cursor: string | null
+    has_prev: boolean
+    has_next: boolean
+  }
+}
+
 // Health check responses
 export interface HealthStatus {
   status: 'healthy' | 'unhealthy' | 'degraded'
@@ -1,6 +1,7 @@
 """
 Admin API endpoints for system management
 """
+from http import HTTPStatus
 from flask import Blueprint, request, jsonify, g
 import logging
 
@@ -23,12 +24,12 @@ admin_bp = Blueprint('admin', __name__)
 def list_users():
     """List all users with pagination and search"""
     try:
-        page = int(request.args.get('page', 1))
-        per_page = min(int(request.args.get('per_page', 20)), 100)
+        per_page = max(1, min(int(request.args.get('per_page', 20)), 100))
         search = request.args.get('search', '').strip()
+        cursor = request.args.get('cursor') or None
         
-        # Get users with pagination
-        result = user_service.list_all_users(page, per_page, search)
+        # Get users with cursor pagination
+        result = user_service.list_all_users(per_page, search, cursor)
         
         return success_response(
             'Users retrieved successfully',
@@ -39,8 +40,9 @@ def list_users():
         logger.error(f"Admin users listing error: {e}")
         return error_response(
             'users_retrieval_failed',
-            'Failed to retrieve users'
-        ), 500
+            'Failed to retrieve users',
+            status=HTTPStatus.INTERNAL_SERVER_ERROR
+        )
 
 @admin_bp.route('/users/<int:user_id>', methods=['GET'])
 @admin_required
@@ -69,8 +71,9 @@ def get_user(user_id):
         logger.error(f"Admin user retrieval error: {e}")
         return error_response(
             'user_retrieval_failed',
-            'Failed to retrieve user details'
-        ), 500
+            'Failed to retrieve user details',
+            status=HTTPStatus.INTERNAL_SERVER_ERROR
+        )
 
 @admin_bp.route('/users/<int:user_id>/activate', methods=['POST'])
 @admin_required
@@ -84,8 +87,9 @@ def activate_user(user_id):
         if user.active:
             return error_response(
                 'user_already_active',
-                'User account is already active'
-            ), 400
+                'User account is already active',
+                status=HTTPStatus.BAD_REQUEST
+            )
         
         user.active = True
         user.locked_until = None
@@ -113,8 +117,9 @@ def activate_user(user_id):
         logger.error(f"User activation error: {e}")
         return error_response(
             'activation_failed',
-            'Failed to activate user'
-        ), 500
+            'Failed to activate user',
+            status=HTTPStatus.INTERNAL_SERVER_ERROR
+        )
 
 @admin_bp.route('/users/<int:user_id>/deactivate', methods=['POST'])
 @admin_required
@@ -129,14 +134,16 @@ def deactivate_user(user_id):
         if user.id == admin.id:
             return error_response(
                 'cannot_deactivate_self',
-                'Cannot deactivate your own account'
-            ), 400
+                'Cannot deactivate your own account',
+                status=HTTPStatus.BAD_REQUEST
+            )
         
         if not user.active:
             return error_response(
                 'user_already_inactive',
-                'User account is already inactive'
-            ), 400
+                'User account is already inactive',
+                status=HTTPStatus.BAD_REQUEST
+            )
         
         user.active = False
         db.session.commit()
@@ -173,8 +180,9 @@ def deactivate_user(user_id):
         logger.error(f"User deactivation error: {e}")
         return error_response(
             'deactivation_failed',
-            'Failed to deactivate user'
-        ), 500
+            'Failed to deactivate user',
+            status=HTTPStatus.INTERNAL_SERVER_ERROR
+        )
 
 @admin_bp.route('/users/<int:user_id>/unlock', methods=['POST'])
 @admin_required
@@ -188,8 +196,9 @@ def unlock_user(user_id):
         if not user.is_locked:
             return error_response(
                 'user_not_locked',
-                'User account is not locked'
-            ), 400
+                'User account is not locked',
+                status=HTTPStatus.BAD_REQUEST
+            )
         
         user.unlock_account()
         
@@ -213,8 +222,9 @@ def unlock_user(user_id):
         logger.error(f"User unlock error: {e}")
         return error_response(
             'unlock_failed',
-            'Failed to unlock user account'
-        ), 500
+            'Failed to unlock user account',
+            status=HTTPStatus.INTERNAL_SERVER_ERROR
+        )
 
 @admin_bp.route('/sessions', methods=['GET'])
 @admin_required
@@ -278,8 +288,9 @@ def list_all_sessions():
         logger.error(f"Admin sessions listing error: {e}")
         return error_response(
             'sessions_retrieval_failed',
-            'Failed to retrieve sessions'
-        ), 500
+            'Failed to retrieve sessions',
+            status=HTTPStatus.INTERNAL_SERVER_ERROR
+        )
 
 @admin_bp.route('/sessions/<session_id>/stop', methods=['POST'])
 @admin_required
@@ -293,8 +304,9 @@ def stop_any_session(session_id):
         if session.status not in [SessionStatus.RUNNING, SessionStatus.CREATING]:
             return error_response(
                 'session_not_running',
-                'Session is not currently running'
-            ), 400
+                'Session is not currently running',
+                status=HTTPStatus.BAD_REQUEST
+            )
         
         # Stop Docker container
         if session.container_id:
@@ -325,8 +337,9 @@ def stop_any_session(session_id):
         logger.error(f"Admin session stop error: {e}")
         return error_response(
             'session_stop_failed',
-            'Failed to stop session'
-        ), 500
+            'Failed to stop session',
+            status=HTTPStatus.INTERNAL_SERVER_ERROR
+        )
 
 @admin_bp.route('/system/stats', methods=['GET'])
 @admin_required
@@ -389,8 +402,9 @@ def get_system_stats():
         logger.error(f"System stats error: {e}")
         return error_response(
             'stats_retrieval_failed',
-            'Failed to retrieve system statistics'
-        ), 500
+            'Failed to retrieve system statistics',
+            status=HTTPStatus.INTERNAL_SERVER_ERROR
+        )
 
 @admin_bp.route('/system/cleanup', methods=['POST'])
 @admin_required
@@ -449,8 +463,9 @@ def system_cleanup():
         logger.error(f"System cleanup error: {e}")
         return error_response(
             'cleanup_failed',
-            'Failed to perform system cleanup'
-        ), 500
+            'Failed to perform system cleanup',
+            status=HTTPStatus.INTERNAL_SERVER_ERROR
+        )
 
 @admin_bp.route('/audit-logs', methods=['GET'])
 @admin_required
@@ -513,8 +528,9 @@ def get_audit_logs():
         logger.error(f"Audit logs retrieval error: {e}")
         return error_response(
             'logs_retrieval_failed',
-            'Failed to retrieve audit logs'
-        ), 500
+            'Failed to retrieve audit logs',
+            status=HTTPStatus.INTERNAL_SERVER_ERROR
+        )
 
 @admin_bp.route('/docker/pull-images', methods=['POST'])
 @admin_required
@@ -547,13 +563,15 @@ def pull_docker_images():
         logger.error(f"Docker images pull error: {e}")
         return error_response(
             'images_pull_failed',
-            'Failed to pull Docker images'
-        ), 500
+            'Failed to pull Docker images',
+            status=HTTPStatus.INTERNAL_SERVER_ERROR
+        )
 
 # Error handlers for admin blueprint
 @admin_bp.errorhandler(403)
 def admin_access_denied(error):
     return error_response(
         'admin_access_required',
-        'Administrator privileges are required to access this resource'
-    ), 403
+        'Administrator privileges are required to access this resource',
+        status=HTTPStatus.FORBIDDEN
+    )
@@ -1,6 +1,7 @@
 """
 Authentication API endpoints
 """
+from http import HTTPStatus
 from flask import Blueprint, request, jsonify, g
 from flask_jwt_extended import get_jwt, get_jwt_identity
 import logging
@@ -30,8 +31,9 @@ def register():
             return error_response(
                 'validation_failed',
                 'Registration data validation failed',
-                validation_result['errors']
-            ), 400
+                validation_result['errors'],
+                status=HTTPStatus.BAD_REQUEST
+            )
         
         # Create user account
         result = user_service.create_user(validation_result['data'])
@@ -42,20 +44,23 @@ def register():
                 {
                     'user': result['user'],
                     'message': result['message']
-                }
-            ), 201
+                },
+                status=HTTPStatus.CREATED
+            )
         else:
             return error_response(
                 result['error'],
-                result['message']
-            ), 400
+                result['message'],
+                status=HTTPStatus.BAD_REQUEST
+            )
             
     except Exception as e:
         logger.error(f"Registration error: {e}")
         return error_response(
             'registration_failed',
-            'Registration service error'
-        ), 500
+            'Registration service error',
+            status=HTTPStatus.INTERNAL_SERVER_ERROR
+        )
 
 @auth_bp.route('/login', methods=['POST'])
 @rate_limit("10 per minute")
@@ -72,8 +77,9 @@ def login():
             return error_response(
                 'validation_failed',
                 'Login data validation failed',
-                validation_result['errors']
-            ), 400
+                validation_result['errors'],
+                status=HTTPStatus.BAD_REQUEST
+            )
         
         # Get client IP for audit logging
         client_ip = request.environ.get('HTTP_X_FORWARDED_FOR', request.remote_addr)
@@ -98,15 +104,17 @@ def login():
         else:
             return error_response(
                 result['error'],
-                result['message']
-            ), 401
+                result['message'],
+                status=HTTPStatus.UNAUTHORIZED
+            )
             
     except Exception as e:
         logger.error(f"Login error: {e}")
         return error_response(
             'login_failed',
-            'Authentication service error'
-        ), 500
+            'Authentication service error',
+            status=HTTPStatus.INTERNAL_SERVER_ERROR
+        )
 
 @auth_bp.route('/logout', methods=['POST'])
 @auth_required()
@@ -125,15 +133,17 @@ def logout():
         else:
             return error_response(
                 result['error'],
-                result['message']
-            ), 500
+                result['message'],
+                status=HTTPStatus.INTERNAL_SERVER_ERROR
+            )
             
     except Exception as e:
         logger.error(f"Logout error: {e}")
         return error_response(
             'logout_failed',
-            'Logout service error'
-        ), 500
+            'Logout service error',
+            status=HTTPStatus.INTERNAL_SERVER_ERROR
+        )
 
 @auth_bp.route('/refresh', methods=['POST'])
 @auth_required()
@@ -160,8 +170,9 @@ def refresh():
         logger.error(f"Token refresh error: {e}")
         return error_response(
             'refresh_failed',
-            'Token refresh service error'
-        ), 500
+            'Token refresh service error',
+            status=HTTPStatus.INTERNAL_SERVER_ERROR
+        )
 
 @auth_bp.route('/profile', methods=['GET'])
 @auth_required()
@@ -186,8 +197,9 @@ def get_profile():
         logger.error(f"Profile retrieval error: {e}")
         return error_response(
             'profile_retrieval_failed',
-            'Profile service error'
-        ), 500
+            'Profile service error',
+            status=HTTPStatus.INTERNAL_SERVER_ERROR
+        )
 
 @auth_bp.route('/profile', methods=['PUT'])
 @auth_required()
@@ -213,15 +225,17 @@ def update_profile():
         else:
             return error_response(
                 result['error'],
-                result['message']
-            ), 400
+                result['message'],
+                status=HTTPStatus.BAD_REQUEST
+            )
             
     except Exception as e:
         logger.error(f"Profile update error: {e}")
         return error_response(
             'profile_update_failed',
-            'Profile update service error'
-        ), 500
+            'Profile update service error',
+            status=HTTPStatus.INTERNAL_SERVER_ERROR
+        )
 
 @auth_bp.route('/change-password', methods=['POST'])
 @auth_required()
@@ -247,8 +261,9 @@ def change_password():
             return error_response(
                 'validation_failed',
                 'New password validation failed',
-                {'new_password': password_validation['errors']}
-            ), 400
+                {'new_password': password_validation['errors']},
+                status=HTTPStatus.BAD_REQUEST
+            )
         
         # Change password
         result = user_service.change_password(
@@ -262,15 +277,17 @@ def change_password():
         else:
             return error_response(
                 result['error'],
-                result['message']
-            ), 400
+                result['message'],
+                status=HTTPStatus.BAD_REQUEST
+            )
             
     except Exception as e:
         logger.error(f"Password change error: {e}")
         return error_response(
             'password_change_failed',
-            'Password change service error'
-        ), 500
+            'Password change service error',
+            status=HTTPStatus.INTERNAL_SERVER_ERROR
+        )
 
 @auth_bp.route('/2fa/setup', methods=['POST'])
 @auth_required()
@@ -295,15 +312,17 @@ def setup_2fa():
         else:
             return error_response(
                 result['error'],
-                result['message']
-            ), 500
+                result['message'],
+                status=HTTPStatus.INTERNAL_SERVER_ERROR
+            )
             
     except Exception as e:
         logger.error(f"2FA setup error: {e}")
         return error_response(
             'setup_failed',
-            '2FA setup service error'
-        ), 500
+            '2FA setup service error',
+            status=HTTPStatus.INTERNAL_SERVER_ERROR
+        )
 
 @auth_bp.route('/2fa/verify', methods=['POST'])
 @auth_required()
@@ -324,15 +343,17 @@ def verify_2fa():
         else:
             return error_response(
                 result['error'],
-                result['message']
-            ), 400
+                result['message'],
+                status=HTTPStatus.BAD_REQUEST
+            )
             
     except Exception as e:
         logger.error(f"2FA verification error: {e}")
         return error_response(
             'verification_failed',
-            '2FA verification service error'
-        ), 500
+            '2FA verification service error',
+            status=HTTPStatus.INTERNAL_SERVER_ERROR
+        )
 
 @auth_bp.route('/sessions', methods=['GET'])
 @auth_required()
@@ -354,8 +375,9 @@ def get_user_sessions():
         logger.error(f"Sessions retrieval error: {e}")
         return error_response(
             'sessions_retrieval_failed',
-            'Sessions service error'
-        ), 500
+            'Sessions service error',
+            status=HTTPStatus.INTERNAL_SERVER_ERROR
+        )
 
 @auth_bp.route('/validate', methods=['GET'])
 @auth_required()
@@ -382,48 +404,55 @@ def validate_token():
         logger.error(f"Token validation error: {e}")
         return error_response(
             'validation_failed',
-            'Token validation service error'
-        ), 500
+            'Token validation service error',
+            status=HTTPStatus.INTERNAL_SERVER_ERROR
+        )
 
 # Error handlers for authentication blueprint
 @auth_bp.errorhandler(400)
 def bad_request(error):
     return error_response(
         'bad_request',
-        'The request could not be understood by the server'
-    ), 400
+        'The request could not be understood by the server',
+        status=HTTPStatus.BAD_REQUEST
+    )
 
 @auth_bp.errorhandler(401)
 def unauthorized(error):
     return error_response(
         'unauthorized',
-        'Authentication credentials were not provided or are invalid'
-    ), 401
+        'Authentication credentials were not provided or are invalid',
+        status=HTTPStatus.UNAUTHORIZED
+    )
 
 @auth_bp.errorhandler(403)
 def forbidden(error):
     return error_response(
         'forbidden',
-        'You do not have permission to access this resource'
-    ), 403
+        'You do not have permission to access this resource',
+        status=HTTPStatus.FORBIDDEN
+    )
 
 @auth_bp.errorhandler(422)
 def unprocessable_entity(error):
     return error_response(
         'unprocessable_entity',
-        'The request was well-formed but contains invalid data'
-    ), 422
+        'The request was well-formed but contains invalid data',
+        status=HTTPStatus.UNPROCESSABLE_ENTITY
+    )
 
 @auth_bp.errorhandler(429)
 def rate_limit_exceeded(error):
     return error_response(
         'rate_limit_exceeded',
-        'Too many requests. Please try again later.'
-    ), 429
+        'Too many requests. Please try again later.',
+        status=HTTPStatus.TOO_MANY_REQUESTS
+    )
 
 @auth_bp.errorhandler(500)
 def internal_server_error(error):
     return error_response(
         'internal_server_error',
-        'An internal server error occurred'
-    ), 500
+        'An internal server error occurred',
+        status=HTTPStatus.INTERNAL_SERVER_ERROR
+    )
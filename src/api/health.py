@@ -1,6 +1,7 @@
 """
 Health check API endpoints
 """
+from http import HTTPStatus
 from flask import Blueprint, jsonify
 import logging
 from datetime import datetime
@@ -35,8 +36,9 @@ def health_check():
         logger.error(f"Health check failed: {e}")
         return error_response(
             'service_unhealthy',
-            'Service health check failed'
-        ), 503
+            'Service health check failed',
+            status=HTTPStatus.SERVICE_UNAVAILABLE
+        )
 
 @health_bp.route('/detailed', methods=['GET'])
 def detailed_health_check():
@@ -121,8 +123,9 @@ def detailed_health_check():
         logger.error(f"Detailed health check failed: {e}")
         return error_response(
             'health_check_failed',
-            'Detailed health check failed'
-        ), 503
+            'Detailed health check failed',
+            status=HTTPStatus.SERVICE_UNAVAILABLE
+        )
 
 @health_bp.route('/ready', methods=['GET'])
 def readiness_check():
@@ -155,15 +158,17 @@ def readiness_check():
         else:
             return error_response(
                 'service_not_ready',
-                'Service is not ready'
-            ), 503
+                'Service is not ready',
+                status=HTTPStatus.SERVICE_UNAVAILABLE
+            )
             
     except Exception as e:
         logger.error(f"Readiness check failed: {e}")
         return error_response(
             'readiness_check_failed',
-            'Readiness check failed'
-        ), 503
+            'Readiness check failed',
+            status=HTTPStatus.SERVICE_UNAVAILABLE
+        )
 
 @health_bp.route('/live', methods=['GET'])
 def liveness_check():
@@ -182,8 +187,9 @@ def liveness_check():
         logger.error(f"Liveness check failed: {e}")
         return error_response(
             'liveness_check_failed',
-            'Liveness check failed'
-        ), 503
+            'Liveness check failed',
+            status=HTTPStatus.SERVICE_UNAVAILABLE
+        )
 
 @health_bp.route('/metrics', methods=['GET'])
 def metrics():
@@ -226,8 +232,9 @@ def metrics():
         logger.error(f"Metrics retrieval failed: {e}")
         return error_response(
             'metrics_failed',
-            'Failed to retrieve metrics'
-        ), 500
+            'Failed to retrieve metrics',
+            status=HTTPStatus.INTERNAL_SERVER_ERROR
+        )
 
 # No authentication required for health endpoints
 # These are typically used by load balancers and monitoring systems
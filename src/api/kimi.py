@@ -1,6 +1,7 @@
 """
 Kimi-Dev-72B integration API endpoints
 """
+from http import HTTPStatus
 from flask import Blueprint, request, jsonify, g
 import logging
 
@@ -31,15 +32,17 @@ def analyze_repository():
             return error_response(
                 'validation_failed',
                 'GitHub URL validation failed',
-                {'github_url': url_validation['errors']}
-            ), 400
+                {'github_url': url_validation['errors']},
+                status=HTTPStatus.BAD_REQUEST
+            )
         
         # Check if Kimi-Dev service is available
         if not kimi_service.is_available():
             return error_response(
                 'service_unavailable',
-                'Kimi-Dev analysis service is not available'
-            ), 503
+                'Kimi-Dev analysis service is not available',
+                status=HTTPStatus.SERVICE_UNAVAILABLE
+            )
         
         # Perform repository analysis
         result = kimi_service.analyze_repository(
@@ -75,15 +78,17 @@ def analyze_repository():
             return error_response(
                 'analysis_failed',
                 result['error'],
-                result.get('details')
-            ), 500
+                result.get('details'),
+                status=HTTPStatus.INTERNAL_SERVER_ERROR
+            )
             
     except Exception as e:
         logger.error(f"Repository analysis error: {e}")
         return error_response(
             'analysis_service_error',
-            'Repository analysis service error'
-        ), 500
+            'Repository analysis service error',
+            status=HTTPStatus.INTERNAL_SERVER_ERROR
+        )
 
 @kimi_bp.route('/analyze/code', methods=['POST'])
 @auth_required()
@@ -100,15 +105,17 @@ def analyze_code():
         if not data['code'].strip():
             return error_response(
                 'validation_failed',
-                'Code snippet cannot be empty'
-            ), 400
+                'Code snippet cannot be empty',
+                status=HTTPStatus.BAD_REQUEST
+            )
         
         # Check if Kimi-Dev service is available
         if not kimi_service.is_available():
             return error_response(
                 'service_unavailable',
-                'Kimi-Dev analysis service is not available'
-            ), 503
+                'Kimi-Dev analysis service is not available',
+                status=HTTPStatus.SERVICE_UNAVAILABLE
+            )
         
         # Get supported languages
         supported_languages = kimi_service.get_supported_languages()
@@ -116,8 +123,9 @@ def analyze_code():
             return error_response(
                 'unsupported_language',
                 f'Language "{data["language"]}" is not supported',
-                {'supported_languages': supported_languages}
-            ), 400
+                {'supported_languages': supported_languages},
+                status=HTTPStatus.BAD_REQUEST
+            )
         
         # Perform code analysis
         result = kimi_service.analyze_code_snippet(
@@ -151,15 +159,17 @@ def analyze_code():
             return error_response(
                 'analysis_failed',
                 result['error'],
-                result.get('details')
-            ), 500
+                result.get('details'),
+                status=HTTPStatus.INTERNAL_SERVER_ERROR
+            )
             
     except Exception as e:
         logger.error(f"Code analysis error: {e}")
         return error_response(
             'analysis_service_error',
-            'Code analysis service error'
-        ), 500
+            'Code analysis service error',
+            status=HTTPStatus.INTERNAL_SERVER_ERROR
+        )
 
 @kimi_bp.route('/debug', methods=['POST'])
 @auth_required()
@@ -176,15 +186,17 @@ def debug_issue():
         if not data['error_message'].strip():
             return error_response(
                 'validation_failed',
-                'Error message cannot be empty'
-            ), 400
+                'Error message cannot be empty',
+                status=HTTPStatus.BAD_REQUEST
+            )
         
         # Check if Kimi-Dev service is available
         if not kimi_service.is_available():
             return error_response(
                 'service_unavailable',
-                'Kimi-Dev debug service is not available'
-            ), 503
+                'Kimi-Dev debug service is not available',
+                status=HTTPStatus.SERVICE_UNAVAILABLE
+            )
         
         # Perform debugging
         result = kimi_service.debug_issue(
@@ -220,15 +232,17 @@ def debug_issue():
             return error_response(
                 'debug_failed',
                 result['error'],
-                result.get('details')
-            ), 500
+                result.get('details'),
+                status=HTTPStatus.INTERNAL_SERVER_ERROR
+            )
             
     except Exception as e:
         logger.error(f"Debug service error: {e}")
         return error_response(
             'debug_service_error',
-            'Debug service error'
-        ), 500
+            'Debug service error',
+            status=HTTPStatus.INTERNAL_SERVER_ERROR
+        )
 
 @kimi_bp.route('/analyze/file', methods=['POST'])
 @auth_required()
@@ -245,15 +259,17 @@ def analyze_file():
         if not data['file_content'].strip():
             return error_response(
                 'validation_failed',
-                'File content cannot be empty'
-            ), 400
+                'File content cannot be empty',
+                status=HTTPStatus.BAD_REQUEST
+            )
         
         # Check if Kimi-Dev service is available
         if not kimi_service.is_available():
             return error_response(
                 'service_unavailable',
-                'Kimi-Dev analysis service is not available'
-            ), 503
+                'Kimi-Dev analysis service is not available',
+                status=HTTPStatus.SERVICE_UNAVAILABLE
+            )
         
         # Perform file analysis
         result = kimi_service.get_file_suggestions(
@@ -287,15 +303,17 @@ def analyze_file():
             return error_response(
                 'analysis_failed',
                 result['error'],
-                result.get('details')
-            ), 500
+                result.get('details'),
+                status=HTTPStatus.INTERNAL_SERVER_ERROR
+            )
             
     except Exception as e:
         logger.error(f"File analysis error: {e}")
         return error_response(
             'analysis_service_error',
-            'File analysis service error'
-        ), 500
+            'File analysis service error',
+            status=HTTPStatus.INTERNAL_SERVER_ERROR
+        )
 
 @kimi_bp.route('/analysis/<analysis_id>/status', methods=['GET'])
 @auth_required()
@@ -307,8 +325,9 @@ def get_analysis_status(analysis_id):
         if not kimi_service.is_available():
             return error_response(
                 'service_unavailable',
-                'Kimi-Dev analysis service is not available'
-            ), 503
+                'Kimi-Dev analysis service is not available',
+                status=HTTPStatus.SERVICE_UNAVAILABLE
+            )
         
         # Get analysis status
         result = kimi_service.get_analysis_status(analysis_id)
@@ -321,15 +340,52 @@ def get_analysis_status(analysis_id):
         else:
             return error_response(
                 'status_retrieval_failed',
-                result['error']
-            ), 404
+                result['error'],
+                status=HTTPStatus.NOT_FOUND
+            )
             
     except Exception as e:
         logger.error(f"Analysis status error: {e}")
         return error_response(
             'status_service_error',
-            'Analysis status service error'
-        ), 500
+            'Analysis status service error',
+            status=HTTPStatus.INTERNAL_SERVER_ERROR
+        )
+
+@kimi_bp.route('/analysis/<analysis_id>/events', methods=['GET'])
+@auth_required()
+@log_api_call()
+def wait_for_analysis_status(analysis_id):
+    """Block until the status of an analysis changes or the timeout expires"""
+    try:
+        since = request.args.get('since')
+        timeout = min(max(request.args.get('timeout', 60, type=int), 1), 120)
+        
+        result = kimi_service.get_analysis_status_longpoll(
+            analysis_id,
+            since_revision=since,
+            timeout=timeout
+        )
+        
+        if result['success']:
+            return success_response(
+                'Analysis status retrieved' if result['changed'] else 'Analysis status unchanged',
+                {'status': result}
+            )
+        else:
+            return error_response(
+                'status_retrieval_failed',
+                result['error'],
+                status=HTTPStatus.NOT_FOUND
+            )
+            
+    except Exception as e:
+        logger.error(f"Analysis status wait error: {e}")
+        return error_response(
+            'status_service_error',
+            'Analysis status service error',
+            status=HTTPStatus.INTERNAL_SERVER_ERROR
+        )
 
 @kimi_bp.route('/analysis/<analysis_id>/results', methods=['GET'])
 @auth_required()
@@ -341,8 +397,9 @@ def get_analysis_results(analysis_id):
         if not kimi_service.is_available():
             return error_response(
                 'service_unavailable',
-                'Kimi-Dev analysis service is not available'
-            ), 503
+                'Kimi-Dev analysis service is not available',
+                status=HTTPStatus.SERVICE_UNAVAILABLE
+            )
         
         # Get analysis results
         result = kimi_service.get_analysis_results(analysis_id)
@@ -355,15 +412,17 @@ def get_analysis_results(analysis_id):
         else:
             return error_response(
                 'results_retrieval_failed',
-                result['error']
-            ), 404
+                result['error'],
+                status=HTTPStatus.NOT_FOUND
+            )
             
     except Exception as e:
         logger.error(f"Analysis results error: {e}")
         return error_response(
             'results_service_error',
-            'Analysis results service error'
-        ), 500
+            'Analysis results service error',
+            status=HTTPStatus.INTERNAL_SERVER_ERROR
+        )
 
 @kimi_bp.route('/languages', methods=['GET'])
 @auth_required()
@@ -382,8 +441,9 @@ def get_supported_languages():
         logger.error(f"Languages retrieval error: {e}")
         return error_response(
             'languages_service_error',
-            'Failed to retrieve supported languages'
-        ), 500
+            'Failed to retrieve supported languages',
+            status=HTTPStatus.INTERNAL_SERVER_ERROR
+        )
 
 @kimi_bp.route('/session', methods=['POST'])
 @auth_required()
@@ -398,8 +458,9 @@ def create_analysis_session():
         if not kimi_service.is_available():
             return error_response(
                 'service_unavailable',
-                'Kimi-Dev analysis service is not available'
-            ), 503
+                'Kimi-Dev analysis service is not available',
+                status=HTTPStatus.SERVICE_UNAVAILABLE
+            )
         
         # Create analysis session
         result = kimi_service.create_analysis_session(user.id)
@@ -421,33 +482,38 @@ def create_analysis_session():
             
             return success_response(
                 'Analysis session created',
-                {'session': result}
-            ), 201
+                {'session': result},
+                status=HTTPStatus.CREATED
+            )
         else:
             return error_response(
                 'session_creation_failed',
                 result['error'],
-                result.get('details')
-            ), 500
+                result.get('details'),
+                status=HTTPStatus.INTERNAL_SERVER_ERROR
+            )
             
     except Exception as e:
         logger.error(f"Analysis session creation error: {e}")
         return error_response(
             'session_service_error',
-            'Analysis session creation service error'
-        ), 500
+            'Analysis session creation service error',
+            status=HTTPStatus.INTERNAL_SERVER_ERROR
+        )
 
 # Error handlers for kimi blueprint
 @kimi_bp.errorhandler(503)
 def service_unavailable(error):
     return error_response(
         'service_unavailable',
-        'The Kimi-Dev analysis service is temporarily unavailable'
-    ), 503
+        'The Kimi-Dev analysis service is temporarily unavailable',
+        status=HTTPStatus.SERVICE_UNAVAILABLE
+    )
 
 @kimi_bp.errorhandler(413)
 def payload_too_large(error):
     return error_response(
         'payload_too_large',
-        'The code snippet or file content is too large to analyze'
-    ), 413
+        'The code snippet or file content is too large to analyze',
+        status=HTTPStatus.REQUEST_ENTITY_TOO_LARGE
+    )
@@ -1,6 +1,7 @@
 """
 Browser sessions API endpoints
 """
+from http import HTTPStatus
 from flask import Blueprint, request, jsonify, g
 import logging
 
@@ -76,8 +77,9 @@ def list_sessions():
         logger.error(f"Sessions listing error: {e}")
         return error_response(
             'sessions_retrieval_failed',
-            'Failed to retrieve sessions'
-        ), 500
+            'Failed to retrieve sessions',
+            status=HTTPStatus.INTERNAL_SERVER_ERROR
+        )
 
 @sessions_bp.route('/', methods=['POST'])
 @auth_required()
@@ -95,8 +97,9 @@ def create_session():
         if active_sessions >= user.max_containers:
             return error_response(
                 'max_containers_reached',
-                f'Maximum number of containers ({user.max_containers}) reached'
-            ), 429
+                f'Maximum number of containers ({user.max_containers}) reached',
+                status=HTTPStatus.TOO_MANY_REQUESTS
+            )
         
         # Validate session data
         validation_result = validate_session_data(data)
@@ -104,15 +107,17 @@ def create_session():
             return error_response(
                 'validation_failed',
                 'Session data validation failed',
-                validation_result['errors']
-            ), 400
+                validation_result['errors'],
+                status=HTTPStatus.BAD_REQUEST
+            )
         
         # Check Docker service availability
         if not docker_service.is_available():
             return error_response(
                 'service_unavailable',
-                'Container service is not available'
-            ), 503
+                'Container service is not available',
+                status=HTTPStatus.SERVICE_UNAVAILABLE
+            )
         
         # Create session record
         session_data = validation_result['data']
@@ -154,8 +159,9 @@ def create_session():
             
             return success_response(
                 'Session created successfully',
-                {'session': session.to_dict()}
-            ), 201
+                {'session': session.to_dict()},
+                status=HTTPStatus.CREATED
+            )
             
         except Exception as container_error:
             # Rollback session creation if container fails
@@ -163,16 +169,18 @@ def create_session():
             logger.error(f"Container creation failed: {container_error}")
             return error_response(
                 'container_creation_failed',
-                f'Failed to create browser container: {str(container_error)}'
-            ), 500
+                f'Failed to create browser container: {str(container_error)}',
+                status=HTTPStatus.INTERNAL_SERVER_ERROR
+            )
         
     except Exception as e:
         db.session.rollback()
         logger.error(f"Session creation error: {e}")
         return error_response(
             'session_creation_failed',
-            'Failed to create session'
-        ), 500
+            'Failed to create session',
+            status=HTTPStatus.INTERNAL_SERVER_ERROR
+        )
 
 @sessions_bp.route('/<session_id>', methods=['GET'])
 @auth_required()
@@ -202,8 +210,9 @@ def get_session(session_id):
         logger.error(f"Session retrieval error: {e}")
         return error_response(
             'session_retrieval_failed',
-            'Failed to retrieve session'
-        ), 500
+            'Failed to retrieve session',
+            status=HTTPStatus.INTERNAL_SERVER_ERROR
+        )
 
 @sessions_bp.route('/<session_id>', methods=['PUT'])
 @auth_required()
@@ -259,8 +268,9 @@ def update_session(session_id):
         logger.error(f"Session update error: {e}")
         return error_response(
             'session_update_failed',
-            'Failed to update session'
-        ), 500
+            'Failed to update session',
+            status=HTTPStatus.INTERNAL_SERVER_ERROR
+        )
 
 @sessions_bp.route('/<session_id>/extend', methods=['POST'])
 @auth_required()
@@ -280,8 +290,9 @@ def extend_session(session_id):
         if not session.is_active:
             return error_response(
                 'session_not_active',
-                'Cannot extend inactive session'
-            ), 400
+                'Cannot extend inactive session',
+                status=HTTPStatus.BAD_REQUEST
+            )
         
         # Extend session
         session.extend_session(hours)
@@ -309,8 +320,9 @@ def extend_session(session_id):
         logger.error(f"Session extension error: {e}")
         return error_response(
             'session_extension_failed',
-            'Failed to extend session'
-        ), 500
+            'Failed to extend session',
+            status=HTTPStatus.INTERNAL_SERVER_ERROR
+        )
 
 @sessions_bp.route('/<session_id>/stop', methods=['POST'])
 @auth_required()
@@ -325,8 +337,9 @@ def stop_session(session_id):
         if session.status not in [SessionStatus.RUNNING, SessionStatus.CREATING]:
             return error_response(
                 'session_not_running',
-                'Session is not currently running'
-            ), 400
+                'Session is not currently running',
+                status=HTTPStatus.BAD_REQUEST
+            )
         
         # Stop Docker container
         if session.container_id:
@@ -357,8 +370,9 @@ def stop_session(session_id):
         logger.error(f"Session stop error: {e}")
         return error_response(
             'session_stop_failed',
-            'Failed to stop session'
-        ), 500
+            'Failed to stop session',
+            status=HTTPStatus.INTERNAL_SERVER_ERROR
+        )
 
 @sessions_bp.route('/<session_id>', methods=['DELETE'])
 @auth_required()
@@ -398,8 +412,9 @@ def delete_session(session_id):
         logger.error(f"Session deletion error: {e}")
         return error_response(
             'session_deletion_failed',
-            'Failed to delete session'
-        ), 500
+            'Failed to delete session',
+            status=HTTPStatus.INTERNAL_SERVER_ERROR
+        )
 
 @sessions_bp.route('/<session_id>/access', methods=['POST'])
 @auth_required()
@@ -413,8 +428,9 @@ def access_session(session_id):
         if not session.is_active:
             return error_response(
                 'session_not_active',
-                'Session is not currently active'
-            ), 400
+                'Session is not currently active',
+                status=HTTPStatus.BAD_REQUEST
+            )
         
         # Check if session has expired
         if session.is_expired:
@@ -422,8 +438,9 @@ def access_session(session_id):
             session.update_status(SessionStatus.EXPIRED)
             return error_response(
                 'session_expired',
-                'Session has expired'
-            ), 410
+                'Session has expired',
+                status=HTTPStatus.GONE
+            )
         
         # Update access time and increment page views
         session.increment_page_views()
@@ -451,8 +468,9 @@ def access_session(session_id):
         logger.error(f"Session access error: {e}")
         return error_response(
             'session_access_failed',
-            'Failed to access session'
-        ), 500
+            'Failed to access session',
+            status=HTTPStatus.INTERNAL_SERVER_ERROR
+        )
 
 @sessions_bp.route('/cleanup', methods=['POST'])
 @auth_required()
@@ -500,27 +518,31 @@ def cleanup_user_sessions():
         logger.error(f"Session cleanup error: {e}")
         return error_response(
             'cleanup_failed',
-            'Failed to clean up sessions'
-        ), 500
+            'Failed to clean up sessions',
+            status=HTTPStatus.INTERNAL_SERVER_ERROR
+        )
 
 # Error handlers for sessions blueprint
 @sessions_bp.errorhandler(404)
 def session_not_found(error):
     return error_response(
         'session_not_found',
-        'The requested session was not found'
-    ), 404
+        'The requested session was not found',
+        status=HTTPStatus.NOT_FOUND
+    )
 
 @sessions_bp.errorhandler(410)
 def session_expired(error):
     return error_response(
         'session_expired',
-        'The session has expired and is no longer available'
-    ), 410
+        'The session has expired and is no longer available',
+        status=HTTPStatus.GONE
+    )
 
 @sessions_bp.errorhandler(503)
 def service_unavailable(error):
     return error_response(
         'service_unavailable',
-        'The container service is temporarily unavailable'
-    ), 503
+        'The container service is temporarily unavailable',
+        status=HTTPStatus.SERVICE_UNAVAILABLE
+    )
@@ -375,7 +375,8 @@ def log_api_call(log_request_body: bool = False, log_response_body: bool = False
                 request=request,
                 response_status=response.status_code if hasattr(response, 'status_code') else 200,
                 response_time_ms=response_time,
-                metadata=metadata
+                metadata=metadata,
+                deferred=True
             )
             
             return response
@@ -4,9 +4,10 @@ JWT token management for authentication
 from datetime import datetime, timedelta
 from typing import Dict, Optional, Any
 from flask import current_app
-from flask_jwt_extended import JWTManager, create_access_token, create_refresh_token, get_jwt, get_jwt_identity
+from flask_jwt_extended import JWTManager, create_access_token, create_refresh_token, get_jwt, get_jwt_identity, get_jti
 import redis
 import json
+import time
 
 class JWTManager:
     """Enhanced JWT token management with blacklisting and additional security"""
@@ -47,6 +48,9 @@ class JWTManager:
                 self._redis_client = None
         except Exception:
             self._redis_client = None
+        
+        # The one client for REDIS_URL; other services read it from here
+        self.app.extensions['redis'] = self._redis_client
     
     def _register_callbacks(self):
         """Register JWT callbacks"""
@@ -102,18 +106,28 @@ class JWTManager:
                 'message': 'The token has been revoked'
             }, 401
     
-    def create_tokens(self, user, additional_claims: Dict[str, Any] = None) -> Dict[str, str]:
-        """Create access and refresh tokens for user"""
+    def create_tokens(self, user, additional_claims: Dict[str, Any] = None,
+                      user_data: Dict[str, Any] = None) -> Dict[str, str]:
+        """Create access and refresh tokens for user (user_data: an existing user.to_dict())"""
         additional_claims = additional_claims or {}
         
         # Add user information to claims
-        additional_claims.update({
-            'username': user.username,
-            'email': user.email,
-            'roles': [role.name for role in user.roles],
-            'is_admin': user.is_admin,
-            'last_login': user.last_login_at.isoformat() if user.last_login_at else None
-        })
+        if user_data is not None:
+            additional_claims.update({
+                'username': user_data['username'],
+                'email': user_data['email'],
+                'roles': user_data['roles'],
+                'is_admin': user_data['is_admin'],
+                'last_login': user_data['last_login_at']
+            })
+        else:
+            additional_claims.update({
+                'username': user.username,
+                'email': user.email,
+                'roles': [role.name for role in user.roles],
+                'is_admin': user.is_admin,
+                'last_login': user.last_login_at.isoformat() if user.last_login_at else None
+            })
         
         access_token = create_access_token(
             identity=user.id,
@@ -125,6 +139,11 @@ class JWTManager:
             additional_claims={'username': user.username, 'email': user.email}
         )
         
+        self._track_user_tokens(user.id, {
+            access_token: self.app.config['JWT_ACCESS_TOKEN_EXPIRES'],
+            refresh_token: self.app.config['JWT_REFRESH_TOKEN_EXPIRES']
+        })
+        
         return {
             'access_token': access_token,
             'refresh_token': refresh_token,
@@ -155,6 +174,54 @@ class JWTManager:
         except Exception:
             return False
     
+    def blacklist_tokens(self, expiries: Dict[str, int]) -> bool:
+        """Blacklist several tokens in a single Redis round trip (jti -> seconds until expiry)"""
+        if not expiries:
+            return True
+        
+        if not self._redis_client:
+            # Use in-memory storage as fallback
+            if not hasattr(self.app, '_jwt_blacklist'):
+                self.app._jwt_blacklist = set()
+            self.app._jwt_blacklist.update(expiries)
+            return True
+        
+        try:
+            # Each entry lives exactly as long as the token it blocks
+            with self._redis_client.pipeline(transaction=False) as pipe:
+                for jti, expiry_seconds in expiries.items():
+                    pipe.setex(f"blacklist:{jti}", max(int(expiry_seconds), 1), "blacklisted")
+                pipe.execute()
+            return True
+        except Exception:
+            return False
+    
+    @staticmethod
+    def _user_tokens_key(user_id: int) -> str:
+        """Sorted set of a user's issued token ids, scored by expiry timestamp"""
+        return f"user_token_expiry:{user_id}"
+    
+    def _track_user_tokens(self, user_id: int, tokens: Dict[str, timedelta]):
+        """Record issued token ids per user so they can be revoked together"""
+        if not self._redis_client:
+            return
+        
+        try:
+            key = self._user_tokens_key(user_id)
+            now = int(time.time())
+            with self._redis_client.pipeline(transaction=False) as pipe:
+                # Drop ids of tokens that have already expired so the set only
+                # ever holds tokens that could still be presented
+                pipe.zremrangebyscore(key, '-inf', now)
+                pipe.zadd(key, {
+                    get_jti(token): now + int(lifetime.total_seconds())
+                    for token, lifetime in tokens.items()
+                })
+                pipe.expire(key, int(self.app.config['JWT_REFRESH_TOKEN_EXPIRES'].total_seconds()))
+                pipe.execute()
+        except Exception:
+            pass
+    
     def is_token_blacklisted(self, jti: str) -> bool:
         """Check if token is blacklisted"""
         if not self._redis_client:
@@ -179,6 +246,20 @@ class JWTManager:
                 int(self.app.config['JWT_REFRESH_TOKEN_EXPIRES'].total_seconds()),
                 "revoked"
             )
+            
+            # Blacklist every unexpired token issued to the user in one pipelined batch
+            key = self._user_tokens_key(user_id)
+            now = int(time.time())
+            with self._redis_client.pipeline(transaction=False) as pipe:
+                pipe.zremrangebyscore(key, '-inf', now)
+                pipe.zrangebyscore(key, now, '+inf', withscores=True)
+                live_tokens = pipe.execute()[1]
+            expiries = {
+                (jti.decode() if isinstance(jti, bytes) else jti): expires_at - now
+                for jti, expires_at in live_tokens
+            }
+            if self.blacklist_tokens(expiries):
+                self._redis_client.delete(key)
             return True
         except Exception:
             return False
@@ -249,6 +330,8 @@ class JWTManager:
             additional_claims=additional_claims
         )
         
+        self._track_user_tokens(user.id, {access_token: self.app.config['JWT_ACCESS_TOKEN_EXPIRES']})
+        
         return {
             'access_token': access_token,
             'expires_in': int(self.app.config['JWT_ACCESS_TOKEN_EXPIRES'].total_seconds())
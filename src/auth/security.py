@@ -4,17 +4,37 @@ Security manager for handling authentication, encryption, and security policies
 import bcrypt
 import secrets
 import pyotp
-import qrcode
-import io
+import segno
 import base64
 from datetime import datetime, timedelta
 from flask import current_app
 from cryptography.fernet import Fernet
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+from argon2 import PasswordHasher
+from argon2.exceptions import VerificationError, InvalidHashError
 import bleach
 import re
 
+from ..config import Config
+
+# Precompiled password strength checks
+_LOWERCASE_RE = re.compile(r'[a-z]')
+_UPPERCASE_RE = re.compile(r'[A-Z]')
+_DIGIT_RE = re.compile(r'\d')
+_SPECIAL_CHAR_RE = re.compile(r'[!@#$%^&*(),.?":{}|<>]')
+_COMMON_PASSWORD_PATTERNS = ('123', 'abc', 'password', 'admin', 'qwerty')
+
+# TOTP tokens are always 6 digits; anything else can be rejected without HMAC work
+_TOTP_TOKEN_RE = re.compile(r'[0-9]{6}')
+
+# Argon2id hasher shared by all requests (46 MiB, 3 passes, configured lane count)
+password_hasher = PasswordHasher(
+    time_cost=3,
+    memory_cost=46 * 1024,
+    parallelism=Config.ARGON2_PARALLELISM
+)
+
 class SecurityManager:
     """Centralized security management"""
     
@@ -44,18 +64,31 @@ class SecurityManager:
         return self._cipher_suite
     
     def hash_password(self, password: str) -> str:
-        """Hash password using bcrypt"""
-        salt = bcrypt.gensalt()
-        hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
-        return hashed.decode('utf-8')
+        """Hash password using Argon2id"""
+        return password_hasher.hash(password)
+    
+    def hash_password_batch(self, passwords: list) -> list:
+        """Hash several passwords with the shared Argon2id hasher"""
+        return [password_hasher.hash(password) for password in passwords]
     
     def verify_password(self, password: str, hashed: str) -> bool:
-        """Verify password against hash"""
+        """Verify password against hash (Argon2id, or legacy bcrypt)"""
         try:
-            return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
-        except (ValueError, TypeError):
+            if hashed.startswith('$2'):
+                return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
+            return password_hasher.verify(hashed, password)
+        except (VerificationError, InvalidHashError, ValueError, TypeError, AttributeError):
             return False
     
+    def password_needs_rehash(self, hashed: str) -> bool:
+        """Check if a stored hash should be upgraded to the current Argon2id parameters"""
+        if not hashed or hashed.startswith('$2'):
+            return True
+        try:
+            return password_hasher.check_needs_rehash(hashed)
+        except InvalidHashError:
+            return True
+    
     def generate_secure_token(self, length: int = 32) -> str:
         """Generate a cryptographically secure random token"""
         return secrets.token_urlsafe(length)
@@ -95,21 +128,16 @@ class SecurityManager:
             issuer_name="Cloud Browser Service"
         )
         
-        qr = qrcode.QRCode(version=1, box_size=10, border=5)
-        qr.add_data(totp_uri)
-        qr.make(fit=True)
-        
-        img = qr.make_image(fill_color="black", back_color="white")
-        img_buffer = io.BytesIO()
-        img.save(img_buffer, format='PNG')
-        img_buffer.seek(0)
-        
-        # Convert to base64 for embedding in HTML
-        img_data = base64.b64encode(img_buffer.read()).decode()
-        return f"data:image/png;base64,{img_data}"
+        # segno writes the PNG itself, so no Pillow image round trip is needed
+        qr = segno.make(totp_uri, error='m')
+        return qr.png_data_uri(scale=10, border=5, dark='black', light='white')
     
     def verify_totp_token(self, secret: str, token: str) -> bool:
         """Verify TOTP token"""
+        token = str(token).strip() if token is not None else ''
+        if not _TOTP_TOKEN_RE.fullmatch(token):
+            return False
+        
         try:
             totp = pyotp.TOTP(secret)
             return totp.verify(token, valid_window=1)  # Allow 1 step tolerance
@@ -184,22 +212,22 @@ class SecurityManager:
             score += 1
         
         # Character variety checks
-        if re.search(r'[a-z]', password):
+        if _LOWERCASE_RE.search(password):
             score += 1
         else:
             errors.append('Password must contain lowercase letters')
         
-        if re.search(r'[A-Z]', password):
+        if _UPPERCASE_RE.search(password):
             score += 1
         else:
             errors.append('Password must contain uppercase letters')
         
-        if re.search(r'\d', password):
+        if _DIGIT_RE.search(password):
             score += 1
         else:
             errors.append('Password must contain numbers')
         
-        if re.search(r'[!@#$%^&*(),.?":{}|<>]', password):
+        if _SPECIAL_CHAR_RE.search(password):
             score += 1
         else:
             errors.append('Password must contain special characters')
@@ -209,8 +237,8 @@ class SecurityManager:
             score += 1
         
         # No common patterns
-        common_patterns = ['123', 'abc', 'password', 'admin', 'qwerty']
-        if any(pattern in password.lower() for pattern in common_patterns):
+        lowered = password.lower()
+        if any(pattern in lowered for pattern in _COMMON_PASSWORD_PATTERNS):
             errors.append('Password contains common patterns')
             score = max(0, score - 1)
         
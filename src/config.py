@@ -46,6 +46,22 @@ class Config:
     SECURITY_TWO_FACTOR = True
     SECURITY_TWO_FACTOR_ENABLED_METHODS = ['authenticator']
     
+    # Argon2id lanes per password hash; part of every stored hash's parameters,
+    # so keep it fixed across hosts rather than tying it to the CPU count
+    ARGON2_PARALLELISM = int(os.environ.get('ARGON2_PARALLELISM', '4'))
+    
+    # Redis (token blacklist, login lookup cache, audit stream). Without it the
+    # blacklist falls back to memory and the login lookup cache is disabled
+    REDIS_URL = os.environ.get('REDIS_URL')
+    
+    # Opt-in Redis stream for audit log entries; only enable it together with a
+    # scheduled `flask drain-audit-log`. Entries are inserted directly when this
+    # or REDIS_URL is unset
+    AUDIT_LOG_STREAM = os.environ.get('AUDIT_LOG_STREAM')
+    AUDIT_LOG_STREAM_GROUP = os.environ.get('AUDIT_LOG_STREAM_GROUP', 'audit_log_writers')
+    # Milliseconds before an unacknowledged entry from a crashed drain is reclaimed
+    AUDIT_LOG_STREAM_CLAIM_IDLE_MS = int(os.environ.get('AUDIT_LOG_STREAM_CLAIM_IDLE_MS', 300000))
+    
     # Rate limiting
     RATELIMIT_STORAGE_URL = os.environ.get('REDIS_URL', 'memory://')
     RATELIMIT_DEFAULT = "100 per hour"
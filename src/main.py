@@ -5,6 +5,7 @@ import os
 import sys
 import logging
 from pathlib import Path
+from http import HTTPStatus
 from flask import Flask, request, g, jsonify
 from flask_cors import CORS
 from datetime import datetime
@@ -15,10 +16,12 @@ sys.path.insert(0, str(Path(__file__).parent))
 
 from config import config
 from models.user import db
+from models.audit import AuditLog
 from auth.jwt_manager import jwt_manager
 from api import api_bp
 from utils.logging_config import setup_logging, log_request
 from utils.database_helpers import init_database, check_database_health
+from utils.json_provider import OrjsonProvider
 from utils.response_helpers import error_response
 
 def create_app(config_name=None):
@@ -33,6 +36,9 @@ def create_app(config_name=None):
     """
     app = Flask(__name__)
     
+    # Serialize every jsonify() response with orjson
+    app.json = OrjsonProvider(app)
+    
     # Determine configuration
     if config_name is None:
         config_name = os.environ.get('FLASK_ENV', 'development')
@@ -158,6 +164,9 @@ def register_middleware(app):
                 if app.config.get('LOG_REQUESTS', True):
                     log_request(request, response, duration)
             
+            # Write audit entries queued during the request in one batch
+            AuditLog.flush_deferred_events()
+            
             # Add security headers
             response.headers['X-Content-Type-Options'] = 'nosniff'
             response.headers['X-Frame-Options'] = 'DENY'
@@ -200,72 +209,82 @@ def register_error_handlers(app):
     def bad_request(error):
         return error_response(
             'bad_request',
-            'The request could not be understood by the server'
-        ), 400
+            'The request could not be understood by the server',
+            status=HTTPStatus.BAD_REQUEST
+        )
     
     @app.errorhandler(401)
     def unauthorized(error):
         return error_response(
             'unauthorized',
-            'Authentication credentials were not provided or are invalid'
-        ), 401
+            'Authentication credentials were not provided or are invalid',
+            status=HTTPStatus.UNAUTHORIZED
+        )
     
     @app.errorhandler(403)
     def forbidden(error):
         return error_response(
             'forbidden',
-            'You do not have permission to access this resource'
-        ), 403
+            'You do not have permission to access this resource',
+            status=HTTPStatus.FORBIDDEN
+        )
     
     @app.errorhandler(404)
     def not_found(error):
         return error_response(
             'not_found',
-            'The requested resource was not found'
-        ), 404
+            'The requested resource was not found',
+            status=HTTPStatus.NOT_FOUND
+        )
     
     @app.errorhandler(405)
     def method_not_allowed(error):
         return error_response(
             'method_not_allowed',
-            'The method is not allowed for the requested URL'
-        ), 405
+            'The method is not allowed for the requested URL',
+            status=HTTPStatus.METHOD_NOT_ALLOWED
+        )
     
     @app.errorhandler(413)
     def payload_too_large(error):
         return error_response(
             'payload_too_large',
-            'The request payload is too large'
-        ), 413
+            'The request payload is too large',
+            status=HTTPStatus.REQUEST_ENTITY_TOO_LARGE
+        )
     
     @app.errorhandler(429)
     def rate_limit_exceeded(error):
         return error_response(
             'rate_limit_exceeded',
-            'Too many requests. Please try again later.'
-        ), 429
+            'Too many requests. Please try again later.',
+            status=HTTPStatus.TOO_MANY_REQUESTS
+        )
     
     @app.errorhandler(500)
     def internal_server_error(error):
         logger.error(f"Internal server error: {error}")
         return error_response(
             'internal_server_error',
-            'An internal server error occurred'
-        ), 500
+            'An internal server error occurred',
+            status=HTTPStatus.INTERNAL_SERVER_ERROR
+        )
     
     @app.errorhandler(502)
     def bad_gateway(error):
         return error_response(
             'bad_gateway',
-            'Bad gateway error'
-        ), 502
+            'Bad gateway error',
+            status=HTTPStatus.BAD_GATEWAY
+        )
     
     @app.errorhandler(503)
     def service_unavailable(error):
         return error_response(
             'service_unavailable',
-            'The service is temporarily unavailable'
-        ), 503
+            'The service is temporarily unavailable',
+            status=HTTPStatus.SERVICE_UNAVAILABLE
+        )
 
 def register_cli_commands(app):
     """Register CLI commands"""
@@ -307,6 +326,13 @@ def register_cli_commands(app):
         else:
             click.echo('No cleanup options specified. Use --help for options.')
     
+    @app.cli.command()
+    @click.option('--batch-size', default=1000, help='Entries inserted per batch')
+    def drain_audit_log(batch_size):
+        """Move queued audit log entries from Redis into the database."""
+        drained = AuditLog.drain_stream(batch_size)
+        click.echo(f'Drained {drained} audit log entries.')
+    
     @app.cli.command()
     @click.argument('backup_path')
     def backup_db(backup_path):
@@ -2,9 +2,14 @@
 Audit log model for security and activity tracking
 """
 from datetime import datetime
+from flask import current_app, g, has_request_context
 from flask_sqlalchemy import SQLAlchemy
 from sqlalchemy import DateTime, String, Integer, Text, ForeignKey, JSON
 from enum import Enum
+import json
+import os
+import socket
+import redis
 
 db = SQLAlchemy()
 
@@ -158,10 +163,33 @@ class AuditLog(db.Model):
         else:
             return SeverityLevel.LOW
     
+    @staticmethod
+    def _normalize_event_type(event_type, kwargs):
+        """
+        Coerce an event type to an EventType member
+        
+        Names outside the enum would be rejected by the event_type column, so
+        they are recorded as API_CALL with the original name added to the tags.
+        """
+        if isinstance(event_type, EventType):
+            return event_type
+        try:
+            return EventType(event_type)
+        except ValueError:
+            kwargs['tags'] = list(kwargs.get('tags') or []) + [str(event_type)]
+            return EventType.API_CALL
+    
     @classmethod
     def log_event(cls, event_type, user=None, session_id=None, message=None, 
-                  ip_address=None, user_agent=None, request=None, **kwargs):
-        """Convenient method to create audit log entries"""
+                  ip_address=None, user_agent=None, request=None, deferred=False, **kwargs):
+        """
+        Convenient method to create audit log entries
+        
+        With deferred=True inside a request, the entry is queued and written
+        together with the request's other entries by flush_deferred_events().
+        """
+        
+        event_type = cls._normalize_event_type(event_type, kwargs)
         
         # Extract request information if request object is provided
         if request:
@@ -190,6 +218,14 @@ class AuditLog(db.Model):
             **kwargs
         )
         
+        if deferred and has_request_context():
+            g.setdefault('_audit_buffer', []).append(audit_log)
+            return audit_log
+        
+        # Hand the entry to the Redis stream when configured, else insert it now
+        if cls._publish_to_stream([audit_log]):
+            return audit_log
+        
         db.session.add(audit_log)
         try:
             db.session.commit()
@@ -201,6 +237,144 @@ class AuditLog(db.Model):
         
         return audit_log
     
+    @classmethod
+    def flush_deferred_events(cls):
+        """Write all audit entries queued during the current request in one batch"""
+        buffer = g.pop('_audit_buffer', None)
+        if not buffer:
+            return 0
+        
+        if cls._publish_to_stream(buffer):
+            return len(buffer)
+        
+        db.session.add_all(buffer)
+        try:
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            # Log to system logger as fallback
+            import logging
+            logging.error(f"Failed to save {len(buffer)} audit logs: {e}")
+            return 0
+        
+        return len(buffer)
+    
+    @staticmethod
+    def _get_stream_client():
+        """Get the shared Redis client for the audit stream, or None if not configured"""
+        if not current_app.config.get('AUDIT_LOG_STREAM'):
+            return None
+        return current_app.extensions.get('redis')
+    
+    def _to_stream_payload(self):
+        """Serialize the entry's column values for the audit stream"""
+        payload = {}
+        for column in self.__table__.columns:
+            if column.key == 'id':
+                continue
+            value = getattr(self, column.key)
+            if isinstance(value, Enum):
+                value = value.value
+            elif isinstance(value, datetime):
+                value = value.isoformat()
+            payload[column.key] = value
+        return json.dumps(payload, default=str)
+    
+    @classmethod
+    def _from_stream_payload(cls, payload):
+        """Build insert values for an entry read back from the audit stream"""
+        values = json.loads(payload)
+        values['event_type'] = EventType(values['event_type'])
+        if values.get('severity'):
+            values['severity'] = SeverityLevel(values['severity'])
+        if values.get('timestamp'):
+            values['timestamp'] = datetime.fromisoformat(values['timestamp'])
+        return values
+    
+    @classmethod
+    def _publish_to_stream(cls, entries):
+        """Append entries to the audit stream; returns False to fall back to a direct insert"""
+        try:
+            client = cls._get_stream_client()
+            if client is None:
+                return False
+            
+            stream = current_app.config['AUDIT_LOG_STREAM']
+            with client.pipeline(transaction=False) as pipe:
+                for entry in entries:
+                    if entry.timestamp is None:
+                        entry.timestamp = datetime.utcnow()
+                    pipe.xadd(stream, {'payload': entry._to_stream_payload()})
+                pipe.execute()
+            return True
+        except Exception as e:
+            import logging
+            logging.error(f"Failed to publish audit logs to stream: {e}")
+            return False
+    
+    @classmethod
+    def drain_stream(cls, batch_size=1000):
+        """
+        Move queued entries from the audit stream into the database
+        
+        Entries are read through a consumer group, so overlapping drains never
+        receive the same entry. Entries left unacknowledged by a drain that died
+        between insert and XACK are reclaimed after AUDIT_LOG_STREAM_CLAIM_IDLE_MS.
+        """
+        client = cls._get_stream_client()
+        if client is None:
+            return 0
+        
+        stream = current_app.config['AUDIT_LOG_STREAM']
+        group = current_app.config.get('AUDIT_LOG_STREAM_GROUP', 'audit_log_writers')
+        claim_idle_ms = current_app.config.get('AUDIT_LOG_STREAM_CLAIM_IDLE_MS', 300000)
+        consumer = f'{socket.gethostname()}:{os.getpid()}'
+        
+        try:
+            client.xgroup_create(stream, group, id='0', mkstream=True)
+        except redis.ResponseError as e:
+            if 'BUSYGROUP' not in str(e):
+                raise
+        
+        drained = 0
+        while True:
+            # Stale entries from a crashed drain first, then new ones
+            messages = client.xautoclaim(
+                stream, group, consumer, min_idle_time=claim_idle_ms, start_id='0-0', count=batch_size
+            )[1]
+            if not messages:
+                response = client.xreadgroup(group, consumer, {stream: '>'}, count=batch_size)
+                messages = response[0][1] if response else []
+            if not messages:
+                break
+            
+            message_ids = [message_id for message_id, _ in messages]
+            rows = []
+            for message_id, fields in messages:
+                if not fields:
+                    continue
+                # An undecodable entry is logged and acknowledged with the batch;
+                # left pending, it would be reclaimed and fail every later drain
+                try:
+                    rows.append(cls._from_stream_payload(fields[b'payload']))
+                except Exception as e:
+                    import logging
+                    logging.error(
+                        f"Dropping undecodable audit stream entry {message_id!r}: {e}; "
+                        f"payload={fields.get(b'payload')!r}"
+                    )
+            if rows:
+                db.session.execute(cls.__table__.insert(), rows)
+                db.session.commit()
+            
+            with client.pipeline() as pipe:
+                pipe.xack(stream, group, *message_ids)
+                pipe.xdel(stream, *message_ids)
+                pipe.execute()
+            drained += len(rows)
+        
+        return drained
+    
     @classmethod
     def log_login_success(cls, user, request=None, **kwargs):
         """Log successful login"""
@@ -26,6 +26,9 @@ class BrowserType(Enum):
 class BrowserSession(db.Model):
     """Browser session model for tracking Docker containers"""
     __tablename__ = 'browser_session'
+    __table_args__ = (
+        db.Index('ix_browser_session_user_browser_status', 'user_id', 'browser_type', 'status'),
+    )
     
     id = db.Column(db.String(64), primary_key=True)  # Container ID
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
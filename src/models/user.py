@@ -23,12 +23,19 @@ class Role(db.Model, RoleMixin):
     permissions = db.Column(db.Text)  # JSON string of permissions
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    # Relationships
+    users = relationship('User', secondary=roles_users, back_populates='roles', lazy='dynamic')
 
     def __repr__(self):
         return f'<Role {self.name}>'
 
 class User(db.Model, UserMixin):
     """User model with enhanced security features"""
+    __table_args__ = (
+        db.Index('ix_user_created_at_id', 'created_at', 'id'),
+    )
+    
     id = db.Column(db.Integer, primary_key=True)
     email = db.Column(db.String(255), unique=True, nullable=False)
     username = db.Column(db.String(80), unique=True, nullable=False)
@@ -70,8 +77,8 @@ class User(db.Model, UserMixin):
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relationships
-    roles = relationship('Role', secondary=roles_users, 
-                        backref=backref('users', lazy='dynamic'))
+    # Roles are needed for every token and API response, so load them with the user
+    roles = relationship('Role', secondary=roles_users, back_populates='users', lazy='joined')
     browser_sessions = relationship('BrowserSession', backref='user', lazy='dynamic', 
                                   cascade='all, delete-orphan')
     audit_logs = relationship('AuditLog', backref='user', lazy='dynamic')
@@ -124,6 +131,7 @@ class User(db.Model, UserMixin):
     
     def to_dict(self):
         """Convert user to dictionary for API responses"""
+        role_names = [role.name for role in self.roles]
         return {
             'id': self.id,
             'email': self.email,
@@ -137,12 +145,12 @@ class User(db.Model, UserMixin):
             'confirmed_at': self.confirmed_at.isoformat() if self.confirmed_at else None,
             'last_login_at': self.last_login_at.isoformat() if self.last_login_at else None,
             'login_count': self.login_count,
-            'is_admin': self.is_admin,
+            'is_admin': 'admin' in role_names,
             'max_containers': self.max_containers,
             'container_timeout': self.container_timeout,
             'preferred_browser': self.preferred_browser,
             'created_at': self.created_at.isoformat(),
-            'roles': [role.name for role in self.roles]
+            'roles': role_names
         }
     
     def __repr__(self):
@@ -11,16 +11,25 @@ from flask import current_app
 import re
 from urllib.parse import urlparse
 import base64
+import hashlib
+import threading
+from collections import OrderedDict
 
 logger = logging.getLogger(__name__)
 
 class KimiDevService:
     """Service for integrating with Kimi-Dev-72B model"""
     
+    # Maximum number of successful analysis results kept in memory
+    RESULT_CACHE_SIZE = 256
+    
     def __init__(self):
         self.api_url = None
         self.api_key = None
         self.session = requests.Session()
+        self._result_cache = OrderedDict()
+        # Request threads share the cache; reordering and eviction must not interleave
+        self._result_cache_lock = threading.Lock()
         self._initialize_service()
     
     def _initialize_service(self):
@@ -39,6 +48,31 @@ class KimiDevService:
                 'Authorization': f'Bearer {self.api_key}'
             })
     
+    @staticmethod
+    def _content_key(*parts: Optional[str]) -> bytes:
+        """Build a compact cache key from a digest of the given content parts"""
+        digest = hashlib.blake2b(digest_size=16)
+        for part in parts:
+            digest.update((part or '').encode('utf-8'))
+            digest.update(b'\x00')
+        return digest.digest()
+    
+    def _get_cached_result(self, key: bytes) -> Optional[Dict[str, Any]]:
+        """Return a cached analysis result and mark it as recently used"""
+        with self._result_cache_lock:
+            result = self._result_cache.get(key)
+            if result is not None:
+                self._result_cache.move_to_end(key)
+            return result
+    
+    def _cache_result(self, key: bytes, result: Dict[str, Any]):
+        """Store a successful analysis result, evicting the oldest entries"""
+        with self._result_cache_lock:
+            self._result_cache[key] = result
+            self._result_cache.move_to_end(key)
+            while len(self._result_cache) > self.RESULT_CACHE_SIZE:
+                self._result_cache.popitem(last=False)
+    
     def is_available(self) -> bool:
         """Check if Kimi-Dev service is available"""
         try:
@@ -147,6 +181,11 @@ class KimiDevService:
             Analysis results dictionary
         """
         try:
+            cache_key = self._content_key('code', code, language, issue_description)
+            cached = self._get_cached_result(cache_key)
+            if cached is not None:
+                return cached
+            
             analysis_request = {
                 'code': code,
                 'language': language,
@@ -171,7 +210,7 @@ class KimiDevService:
             
             if response.status_code == 200:
                 result = response.json()
-                return {
+                analysis = {
                     'success': True,
                     'analysis_id': result.get('analysis_id'),
                     'issues': result.get('issues', []),
@@ -181,6 +220,8 @@ class KimiDevService:
                     'confidence_score': result.get('confidence_score', 0),
                     'analyzed_at': datetime.utcnow().isoformat()
                 }
+                self._cache_result(cache_key, analysis)
+                return analysis
             else:
                 return {
                     'success': False,
@@ -282,6 +323,11 @@ class KimiDevService:
             if not language:
                 language = self._detect_language_from_path(file_path)
             
+            cache_key = self._content_key('file', file_content, file_path, language)
+            cached = self._get_cached_result(cache_key)
+            if cached is not None:
+                return cached
+            
             suggestion_request = {
                 'file_path': file_path,
                 'file_content': file_content,
@@ -304,7 +350,7 @@ class KimiDevService:
             
             if response.status_code == 200:
                 result = response.json()
-                return {
+                suggestions = {
                     'success': True,
                     'file_path': file_path,
                     'language': language,
@@ -314,6 +360,8 @@ class KimiDevService:
                     'improvements': result.get('improvements', []),
                     'analyzed_at': datetime.utcnow().isoformat()
                 }
+                self._cache_result(cache_key, suggestions)
+                return suggestions
             else:
                 return {
                     'success': False,
@@ -370,6 +418,67 @@ class KimiDevService:
                 'details': str(e)
             }
     
+    def get_analysis_status_longpoll(self, analysis_id: str, since_revision: str = None,
+                                     timeout: int = 60) -> Dict[str, Any]:
+        """
+        Wait for the status of an analysis to change (long-poll)
+        
+        Args:
+            analysis_id: ID of the analysis to check
+            since_revision: Last status revision seen by the caller (optional)
+            timeout: Maximum number of seconds the server may hold the request
+            
+        Returns:
+            Analysis status dictionary, with 'changed' set to False on timeout
+        """
+        try:
+            response = self.session.post(
+                f"{self.api_url}/api/v1/analysis/{analysis_id}/events",
+                json={'since': since_revision, 'timeout': timeout},
+                timeout=timeout + 10
+            )
+            
+            if response.status_code == 200:
+                result = response.json()
+                return {
+                    'success': True,
+                    'changed': True,
+                    'analysis_id': analysis_id,
+                    'revision': result.get('revision'),
+                    'status': result.get('status', 'unknown'),
+                    'progress': result.get('progress', 0),
+                    'estimated_completion': result.get('estimated_completion'),
+                    'current_step': result.get('current_step', ''),
+                    'results_available': result.get('results_available', False)
+                }
+            elif response.status_code == 304:
+                return {
+                    'success': True,
+                    'changed': False,
+                    'analysis_id': analysis_id,
+                    'revision': since_revision
+                }
+            else:
+                return {
+                    'success': False,
+                    'error': f'Status wait failed with status {response.status_code}'
+                }
+                
+        except requests.exceptions.Timeout:
+            return {
+                'success': True,
+                'changed': False,
+                'analysis_id': analysis_id,
+                'revision': since_revision
+            }
+        except Exception as e:
+            logger.error(f"Analysis status long-poll failed: {e}")
+            return {
+                'success': False,
+                'error': 'Status check service error',
+                'details': str(e)
+            }
+    
     def get_analysis_results(self, analysis_id: str) -> Dict[str, Any]:
         """
         Get the results of a completed analysis
@@ -3,17 +3,152 @@ User service for managing user accounts and operations
 """
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any
+from concurrent.futures import ThreadPoolExecutor
 from flask import current_app, request
+from sqlalchemy import case, exists, func, lambda_stmt, or_, select
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload, defer
 import logging
+import os
+import base64
+import secrets
+
+from ..models.user import User, Role, db, roles_users
+from ..models.session import BrowserSession, SessionStatus
+from ..models.audit import AuditLog, EventType
+from ..auth.security import security_manager
+from ..auth.jwt_manager import jwt_manager
 
 logger = logging.getLogger(__name__)
 
+# Seconds an identifier without a matching account is remembered
+UNKNOWN_IDENTIFIER_TTL = 60
+
 class UserService:
     """Service for user management operations"""
     
+    # Profile fields users may update
+    _UPDATABLE = frozenset((
+        'first_name', 'last_name', 'timezone', 'preferred_browser',
+        'max_containers', 'container_timeout', 'avatar_url'
+    ))
+    
+    # Profile fields whose previous values are recorded in the audit log
+    _AUDITED = frozenset((
+        'first_name', 'last_name', 'timezone', 'preferred_browser',
+        'max_containers', 'container_timeout'
+    ))
+    
     def __init__(self):
-        pass
+        # Argon2 releases the GIL, so hashing runs in parallel on a bounded pool
+        self._hash_pool = ThreadPoolExecutor(
+            max_workers=os.cpu_count() or 1,
+            thread_name_prefix='password-hash'
+        )
+        
+        # Hash checked against when a login names no account (see _get_dummy_hash)
+        self._dummy_hash = None
+        
+        # Role ids by name; roles are created once at startup and never renamed
+        self._role_ids = {}
+    
+    @staticmethod
+    def _get_redis_client():
+        """
+        Get the shared Redis client for the negative lookup cache
+        
+        The cache must be visible to every worker, or a worker would keep
+        rejecting an identifier another worker just registered; without Redis
+        it is disabled rather than kept per process.
+        """
+        return current_app.extensions.get('redis')
+    
+    def _is_unknown_identifier(self, identifier: str) -> bool:
+        """Check if an identifier recently failed to match any account"""
+        redis_client = self._get_redis_client()
+        if not redis_client:
+            return False
+        
+        try:
+            return redis_client.exists(f"unknown_identifier:{identifier}") > 0
+        except Exception:
+            return False
+    
+    def _remember_unknown_identifier(self, identifier: str):
+        """Remember that an identifier did not match any account"""
+        redis_client = self._get_redis_client()
+        if not redis_client:
+            return
+        
+        try:
+            redis_client.setex(
+                f"unknown_identifier:{identifier}",
+                UNKNOWN_IDENTIFIER_TTL,
+                "1"
+            )
+        except Exception:
+            pass
+    
+    def _forget_unknown_identifiers(self, *identifiers: str):
+        """Drop identifiers from the negative lookup cache once an account uses them"""
+        redis_client = self._get_redis_client()
+        if not redis_client:
+            return
+        
+        try:
+            redis_client.delete(*[f"unknown_identifier:{identifier}" for identifier in identifiers])
+        except Exception:
+            pass
+    
+    def _get_dummy_hash(self) -> str:
+        """Get a hash of a random password for verifying against unknown accounts"""
+        if self._dummy_hash is None:
+            self._dummy_hash = self._hash_password(secrets.token_hex(16))
+        return self._dummy_hash
+    
+    def _reject_unknown_identifier(self, identifier: str, password: str,
+                                   ip_address: str = None) -> Dict[str, Any]:
+        """Fail a login for an identifier with no account, whether or not it was cached"""
+        # Spend the same hashing work as a real verification so the
+        # response time does not reveal whether the account exists
+        self._verify_password(password, self._get_dummy_hash())
+        
+        AuditLog.log_login_failed(
+            username=identifier,
+            ip_address=ip_address,
+            reason="User not found",
+            request=request,
+            deferred=True
+        )
+        return {
+            'success': False,
+            'error': 'invalid_credentials',
+            'message': 'Invalid email/username or password'
+        }
+    
+    def _get_role_id(self, name: str) -> Optional[int]:
+        """Get a role id by name, cached for the lifetime of the process"""
+        role_id = self._role_ids.get(name)
+        if role_id is None:
+            role_id = Role.query.filter_by(name=name).with_entities(Role.id).scalar()
+            if role_id is not None:
+                self._role_ids[name] = role_id
+        return role_id
+    
+    def _hash_password(self, password: str) -> str:
+        """Hash a password on the hashing thread pool"""
+        return self._hash_pool.submit(security_manager.hash_password, password).result()
+    
+    def _verify_password(self, password: str, hashed: str) -> bool:
+        """Verify a password on the hashing thread pool"""
+        return self._hash_pool.submit(security_manager.verify_password, password, hashed).result()
+    
+    @staticmethod
+    def _find_user_by_identifier_stmt(identifier: str):
+        """Build the cached lambda statement finding a user (with roles) by email or username"""
+        stmt = lambda_stmt(lambda: select(User).options(joinedload(User.roles)))
+        stmt += lambda s: s.where(or_(User.email == identifier, User.username == identifier))
+        return stmt
     
     def create_user(self, user_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -25,33 +160,29 @@ class UserService:
         Returns:
             Result dictionary with user info or error
         """
-        from ..models.user import User, Role, db
-        from ..models.audit import AuditLog, EventType
-        from ..auth.security import security_manager
-        
         try:
-            # Check if user already exists
-            existing_user = User.query.filter(
-                (User.email == user_data['email']) | 
-                (User.username == user_data['username'])
-            ).first()
-            
-            if existing_user:
-                if existing_user.email == user_data['email']:
-                    return {
-                        'success': False,
-                        'error': 'email_exists',
-                        'message': 'Email address is already registered'
-                    }
-                else:
-                    return {
-                        'success': False,
-                        'error': 'username_exists',
-                        'message': 'Username is already taken'
-                    }
+            # Check if user already exists: both index-only EXISTS probes in one round trip
+            taken = db.session.execute(select(
+                exists().where(User.email == user_data['email']).label('email'),
+                exists().where(User.username == user_data['username']).label('username')
+            )).one()
+            
+            if taken.email:
+                return {
+                    'success': False,
+                    'error': 'email_exists',
+                    'message': 'Email address is already registered'
+                }
+            
+            if taken.username:
+                return {
+                    'success': False,
+                    'error': 'username_exists',
+                    'message': 'Username is already taken'
+                }
             
             # Hash password
-            hashed_password = security_manager.hash_password(user_data['password'])
+            hashed_password = self._hash_password(user_data['password'])
             
             # Create user
             user = User(
@@ -64,23 +195,30 @@ class UserService:
                 confirmed_at=datetime.utcnow()  # Auto-confirm for now
             )
             
-            # Assign default user role
-            user_role = Role.query.filter_by(name='user').first()
-            if user_role:
-                user.roles.append(user_role)
-            
             db.session.add(user)
+            
+            # Assign default user role straight through the association table
+            user_role_id = self._get_role_id('user')
+            if user_role_id is not None:
+                db.session.flush()
+                db.session.execute(
+                    roles_users.insert().values(user_id=user.id, role_id=user_role_id)
+                )
+            
             db.session.commit()
             
+            self._forget_unknown_identifiers(user.email, user.username)
+            
             # Log user creation
             AuditLog.log_event(
                 EventType.USER_CREATED,
                 user=user,
                 request=request,
-                message=f"User account created: {user.username}"
+                message=f"User account created: {user.username}",
+                deferred=True
             )
             
-            logger.info(f"Created user account: {user.username}")
+            logger.info("Created user account: %s", user.username)
             
             return {
                 'success': True,
@@ -90,7 +228,7 @@ class UserService:
             
         except IntegrityError as e:
             db.session.rollback()
-            logger.error(f"Integrity error creating user: {e}")
+            logger.error("Integrity error creating user: %s", e)
             return {
                 'success': False,
                 'error': 'database_error',
@@ -99,7 +237,7 @@ class UserService:
             
         except Exception as e:
             db.session.rollback()
-            logger.error(f"Error creating user: {e}")
+            logger.error("Error creating user: %s", e)
             return {
                 'success': False,
                 'error': 'creation_failed',
@@ -119,30 +257,19 @@ class UserService:
         Returns:
             Authentication result dictionary
         """
-        from ..models.user import User, db
-        from ..models.audit import AuditLog, EventType
-        from ..auth.security import security_manager
-        from ..auth.jwt_manager import jwt_manager
-        
         try:
+            # Skip the database for identifiers that recently matched no account
+            if self._is_unknown_identifier(identifier):
+                return self._reject_unknown_identifier(identifier, password, ip_address)
+            
             # Find user by email or username
-            user = User.query.filter(
-                (User.email == identifier) | (User.username == identifier)
-            ).first()
+            user = db.session.execute(
+                self._find_user_by_identifier_stmt(identifier)
+            ).unique().scalar_one_or_none()
             
             if not user:
-                # Log failed attempt
-                AuditLog.log_login_failed(
-                    username=identifier,
-                    ip_address=ip_address,
-                    reason="User not found",
-                    request=request
-                )
-                return {
-                    'success': False,
-                    'error': 'invalid_credentials',
-                    'message': 'Invalid email/username or password'
-                }
+                self._remember_unknown_identifier(identifier)
+                return self._reject_unknown_identifier(identifier, password, ip_address)
             
             # Check if account is locked
             if user.is_locked:
@@ -150,7 +277,8 @@ class UserService:
                     username=user.username,
                     ip_address=ip_address,
                     reason="Account locked",
-                    request=request
+                    request=request,
+                    deferred=True
                 )
                 return {
                     'success': False,
@@ -164,7 +292,8 @@ class UserService:
                     username=user.username,
                     ip_address=ip_address,
                     reason="Account inactive",
-                    request=request
+                    request=request,
+                    deferred=True
                 )
                 return {
                     'success': False,
@@ -173,14 +302,15 @@ class UserService:
                 }
             
             # Verify password
-            if not security_manager.verify_password(password, user.password):
+            if not self._verify_password(password, user.password):
                 user.increment_failed_login()
                 
                 AuditLog.log_login_failed(
                     username=user.username,
                     ip_address=ip_address,
                     reason="Invalid password",
-                    request=request
+                    request=request,
+                    deferred=True
                 )
                 return {
                     'success': False,
@@ -188,35 +318,59 @@ class UserService:
                     'message': 'Invalid email/username or password'
                 }
             
-            # Successful authentication
-            user.reset_failed_login()
+            # Successful authentication: reset failed logins and update login
+            # information in a single targeted UPDATE
+            login_values = {
+                User.failed_login_attempts: 0,
+                User.locked_until: None,
+                User.last_login_at: user.current_login_at,
+                User.last_login_ip: user.current_login_ip,
+                User.current_login_at: datetime.utcnow(),
+                User.current_login_ip: ip_address,
+                User.login_count: func.coalesce(User.login_count, 0) + 1
+            }
             
-            # Update login information
-            user.last_login_at = user.current_login_at
-            user.last_login_ip = user.current_login_ip
-            user.current_login_at = datetime.utcnow()
-            user.current_login_ip = ip_address
-            user.login_count += 1
+            # Upgrade legacy bcrypt or outdated Argon2 hashes transparently
+            if security_manager.password_needs_rehash(user.password):
+                login_values[User.password] = self._hash_password(password)
             
-            db.session.commit()
+            # Serialize once from the already loaded row and roles, with the
+            # values the UPDATE writes; the token claims reuse the same role list
+            user_data = user.to_dict()
+            user_data['last_login_at'] = user.current_login_at.isoformat() if user.current_login_at else None
+            user_data['login_count'] = (user.login_count or 0) + 1
+            
+            User.query.filter(User.id == user.id).update(
+                login_values, synchronize_session=False
+            )
+            
+            # Keep the instance loaded through the commit so building the
+            # tokens and the audit entry does not SELECT the row again
+            session = db.session()
+            expire_on_commit = session.expire_on_commit
+            session.expire_on_commit = False
+            try:
+                session.commit()
+            finally:
+                session.expire_on_commit = expire_on_commit
             
             # Create JWT tokens
-            tokens = jwt_manager.create_tokens(user)
+            tokens = jwt_manager.create_tokens(user, user_data=user_data)
             
             # Log successful login
-            AuditLog.log_login_success(user, request=request)
+            AuditLog.log_login_success(user, request=request, deferred=True)
             
-            logger.info(f"User {user.username} logged in successfully")
+            logger.info("User %s logged in successfully", user.username)
             
             return {
                 'success': True,
-                'user': user.to_dict(),
+                'user': user_data,
                 'tokens': tokens,
                 'message': 'Login successful'
             }
             
         except Exception as e:
-            logger.error(f"Authentication error: {e}")
+            logger.error("Authentication error: %s", e)
             return {
                 'success': False,
                 'error': 'authentication_failed',
@@ -234,9 +388,6 @@ class UserService:
         Returns:
             Logout result dictionary
         """
-        from ..models.audit import AuditLog, EventType
-        from ..auth.jwt_manager import jwt_manager
-        
         try:
             # Blacklist token if provided
             if token_jti:
@@ -250,7 +401,7 @@ class UserService:
                 message=f"User {user.username} logged out"
             )
             
-            logger.info(f"User {user.username} logged out")
+            logger.info("User %s logged out", user.username)
             
             return {
                 'success': True,
@@ -258,7 +409,7 @@ class UserService:
             }
             
         except Exception as e:
-            logger.error(f"Logout error: {e}")
+            logger.error("Logout error: %s", e)
             return {
                 'success': False,
                 'error': 'logout_failed',
@@ -276,37 +427,29 @@ class UserService:
         Returns:
             Update result dictionary
         """
-        from ..models.user import db
-        from ..models.audit import AuditLog, EventType
-        
         try:
-            # Store old values for audit
-            old_values = {
-                'first_name': user.first_name,
-                'last_name': user.last_name,
-                'timezone': user.timezone,
-                'preferred_browser': user.preferred_browser,
-                'max_containers': user.max_containers,
-                'container_timeout': user.container_timeout
-            }
+            # Only the allowed fields present in the request need comparing
+            requested_fields = update_data.keys() & self._UPDATABLE
+            if not requested_fields:
+                return {
+                    'success': True,
+                    'user': user.to_dict(),
+                    'updated_fields': [],
+                    'message': 'No changes made'
+                }
             
-            # Update allowed fields
-            updatable_fields = [
-                'first_name', 'last_name', 'timezone', 'preferred_browser',
-                'max_containers', 'container_timeout', 'avatar_url'
-            ]
-            
-            updated_fields = []
-            for field in updatable_fields:
-                if field in update_data:
-                    old_value = getattr(user, field)
-                    new_value = update_data[field]
-                    
-                    if old_value != new_value:
-                        setattr(user, field, new_value)
-                        updated_fields.append(field)
+            updated_fields = sorted(
+                field for field in requested_fields
+                if getattr(user, field) != update_data[field]
+            )
             
             if updated_fields:
+                # Store old values for audit
+                old_values = {field: getattr(user, field) for field in self._AUDITED}
+                
+                for field in updated_fields:
+                    setattr(user, field, update_data[field])
+                
                 user.updated_at = datetime.utcnow()
                 db.session.commit()
                 
@@ -320,7 +463,7 @@ class UserService:
                     new_values={field: getattr(user, field) for field in updated_fields}
                 )
                 
-                logger.info(f"Updated profile for user {user.username}: {', '.join(updated_fields)}")
+                logger.info("Updated profile for user %s: %s", user.username, ', '.join(updated_fields))
             
             return {
                 'success': True,
@@ -331,7 +474,7 @@ class UserService:
             
         except Exception as e:
             db.session.rollback()
-            logger.error(f"Profile update error: {e}")
+            logger.error("Profile update error: %s", e)
             return {
                 'success': False,
                 'error': 'update_failed',
@@ -351,14 +494,9 @@ class UserService:
         Returns:
             Password change result dictionary
         """
-        from ..models.user import db
-        from ..models.audit import AuditLog, EventType
-        from ..auth.security import security_manager
-        from ..auth.jwt_manager import jwt_manager
-        
         try:
             # Verify current password
-            if not security_manager.verify_password(current_password, user.password):
+            if not self._verify_password(current_password, user.password):
                 return {
                     'success': False,
                     'error': 'invalid_current_password',
@@ -366,11 +504,13 @@ class UserService:
                 }
             
             # Hash new password
-            new_hashed_password = security_manager.hash_password(new_password)
+            new_hashed_password = self._hash_password(new_password)
             
             # Update password
-            user.password = new_hashed_password
-            user.updated_at = datetime.utcnow()
+            User.query.filter(User.id == user.id).update(
+                {User.password: new_hashed_password, User.updated_at: datetime.utcnow()},
+                synchronize_session=False
+            )
             db.session.commit()
             
             # Revoke all existing tokens to force re-login
@@ -384,7 +524,7 @@ class UserService:
                 message=f"Password changed for user {user.username}"
             )
             
-            logger.info(f"Password changed for user {user.username}")
+            logger.info("Password changed for user %s", user.username)
             
             return {
                 'success': True,
@@ -393,7 +533,7 @@ class UserService:
             
         except Exception as e:
             db.session.rollback()
-            logger.error(f"Password change error: {e}")
+            logger.error("Password change error: %s", e)
             return {
                 'success': False,
                 'error': 'password_change_failed',
@@ -410,10 +550,6 @@ class UserService:
         Returns:
             2FA setup result dictionary
         """
-        from ..models.user import db
-        from ..models.audit import AuditLog, EventType
-        from ..auth.security import security_manager
-        
         try:
             # Generate TOTP secret
             totp_secret = security_manager.generate_totp_secret()
@@ -436,7 +572,7 @@ class UserService:
                 message=f"Two-factor authentication setup initiated for {user.username}"
             )
             
-            logger.info(f"2FA setup initiated for user {user.username}")
+            logger.info("2FA setup initiated for user %s", user.username)
             
             return {
                 'success': True,
@@ -447,7 +583,7 @@ class UserService:
             
         except Exception as e:
             db.session.rollback()
-            logger.error(f"2FA setup error: {e}")
+            logger.error("2FA setup error: %s", e)
             return {
                 'success': False,
                 'error': 'setup_failed',
@@ -465,8 +601,6 @@ class UserService:
         Returns:
             Verification result dictionary
         """
-        from ..auth.security import security_manager
-        
         try:
             if not user.tf_totp_secret:
                 return {
@@ -482,13 +616,13 @@ class UserService:
             is_valid = security_manager.verify_totp_token(decrypted_secret, token)
             
             if is_valid:
-                logger.info(f"2FA token verified for user {user.username}")
+                logger.info("2FA token verified for user %s", user.username)
                 return {
                     'success': True,
                     'message': 'Two-factor authentication verified'
                 }
             else:
-                logger.warning(f"Invalid 2FA token for user {user.username}")
+                logger.warning("Invalid 2FA token for user %s", user.username)
                 return {
                     'success': False,
                     'error': 'invalid_token',
@@ -496,7 +630,7 @@ class UserService:
                 }
                 
         except Exception as e:
-            logger.error(f"2FA verification error: {e}")
+            logger.error("2FA verification error: %s", e)
             return {
                 'success': False,
                 'error': 'verification_failed',
@@ -514,11 +648,17 @@ class UserService:
             List of session dictionaries
         """
         try:
-            sessions = user.browser_sessions.order_by('created_at desc').all()
+            # Skip the columns to_dict() never reads
+            sessions = user.browser_sessions.options(
+                defer(BrowserSession.vnc_password),
+                defer(BrowserSession.environment_vars),
+                defer(BrowserSession.user_agent),
+                defer(BrowserSession.last_error_at)
+            ).order_by(BrowserSession.created_at.desc()).all()
             return [session.to_dict() for session in sessions]
             
         except Exception as e:
-            logger.error(f"Error getting user sessions: {e}")
+            logger.error("Error getting user sessions: %s", e)
             return []
     
     def get_user_statistics(self, user: 'User') -> Dict[str, Any]:
@@ -532,26 +672,20 @@ class UserService:
             Statistics dictionary
         """
         try:
-            from ..models.session import BrowserSession, SessionStatus
-            from sqlalchemy import func
-            
-            # Get session statistics
-            total_sessions = user.browser_sessions.count()
-            active_sessions = user.browser_sessions.filter_by(status=SessionStatus.RUNNING).count()
-            
-            # Get total session time
-            completed_sessions = user.browser_sessions.filter(
-                BrowserSession.session_duration.isnot(None)
-            ).all()
-            
-            total_session_time = sum(session.session_duration for session in completed_sessions)
-            
-            # Get most used browser
+            # Aggregate all session statistics per browser in a single query
             browser_usage = user.browser_sessions.with_entities(
                 BrowserSession.browser_type,
-                func.count(BrowserSession.id).label('count')
+                func.count(BrowserSession.id).label('count'),
+                func.sum(
+                    case((BrowserSession.status == SessionStatus.RUNNING, 1), else_=0)
+                ).label('active'),
+                func.coalesce(func.sum(BrowserSession.session_duration), 0).label('duration')
             ).group_by(BrowserSession.browser_type).all()
             
+            total_sessions = sum(usage.count for usage in browser_usage)
+            active_sessions = sum(usage.active or 0 for usage in browser_usage)
+            total_session_time = sum(usage.duration for usage in browser_usage)
+            
             most_used_browser = max(browser_usage, key=lambda x: x.count)[0].value if browser_usage else None
             
             return {
@@ -567,65 +701,94 @@ class UserService:
             }
             
         except Exception as e:
-            logger.error(f"Error getting user statistics: {e}")
+            logger.error("Error getting user statistics: %s", e)
             return {}
     
-    def list_all_users(self, page: int = 1, per_page: int = 20, 
-                      search: str = None) -> Dict[str, Any]:
+    @staticmethod
+    def _encode_user_cursor(user: 'User') -> str:
+        """Encode the keyset position of a user as an opaque cursor"""
+        raw = f"{user.created_at.isoformat()}|{user.id}"
+        return base64.urlsafe_b64encode(raw.encode()).decode()
+    
+    @staticmethod
+    def _decode_user_cursor(cursor: str):
+        """Decode a cursor into its (created_at, id) keyset position"""
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        created_at, user_id = raw.rsplit('|', 1)
+        return datetime.fromisoformat(created_at), int(user_id)
+    
+    def list_all_users(self, per_page: int = 20, search: str = None,
+                      cursor: str = None) -> Dict[str, Any]:
         """
         List all users (admin function)
         
         Args:
-            page: Page number
             per_page: Users per page
             search: Search term for username/email
+            cursor: Cursor returned with the previous page (optional)
             
         Returns:
-            Paginated users dictionary
+            Cursor-paginated users dictionary
         """
-        from ..models.user import User
-        
         try:
             query = User.query
             
             # Apply search filter
             if search:
                 search_term = f"%{search}%"
-                query = query.filter(
-                    (User.username.ilike(search_term)) |
-                    (User.email.ilike(search_term)) |
-                    (User.first_name.ilike(search_term)) |
-                    (User.last_name.ilike(search_term))
-                )
+                if db.engine.dialect.name == 'postgresql':
+                    # Matches the expression of the users_search_trgm GIN index
+                    search_document = (
+                        User.username + ' ' + User.email + ' ' +
+                        func.coalesce(User.first_name, '') + ' ' +
+                        func.coalesce(User.last_name, '')
+                    )
+                    query = query.filter(search_document.ilike(search_term))
+                else:
+                    query = query.filter(
+                        (User.username.ilike(search_term)) |
+                        (User.email.ilike(search_term)) |
+                        (User.first_name.ilike(search_term)) |
+                        (User.last_name.ilike(search_term))
+                    )
+            
+            # Seek past the last user of the previous page
+            if cursor:
+                try:
+                    cursor_created_at, cursor_id = self._decode_user_cursor(cursor)
+                except (ValueError, UnicodeDecodeError):
+                    logger.warning("Ignoring invalid users cursor: %s", cursor)
+                    cursor = None
+                else:
+                    query = query.filter(
+                        (User.created_at < cursor_created_at) |
+                        ((User.created_at == cursor_created_at) & (User.id < cursor_id))
+                    )
             
-            # Paginate results
-            pagination = query.order_by(User.created_at.desc()).paginate(
-                page=page,
-                per_page=per_page,
-                error_out=False
-            )
+            # Fetch one extra row to know whether another page exists
+            users = query.order_by(User.created_at.desc(), User.id.desc()).limit(per_page + 1).all()
+            has_next = len(users) > per_page
+            users = users[:per_page]
             
             return {
-                'users': [user.to_dict() for user in pagination.items],
+                'users': [user.to_dict() for user in users],
                 'pagination': {
-                    'page': page,
                     'per_page': per_page,
-                    'total': pagination.total,
-                    'pages': pagination.pages,
-                    'has_prev': pagination.has_prev,
-                    'has_next': pagination.has_next
+                    'cursor': cursor,
+                    'next_cursor': self._encode_user_cursor(users[-1]) if has_next else None,
+                    'has_prev': cursor is not None,
+                    'has_next': has_next
                 }
             }
             
         except Exception as e:
-            logger.error(f"Error listing users: {e}")
+            logger.error("Error listing users: %s", e)
             return {
                 'users': [],
                 'pagination': {
-                    'page': 1,
                     'per_page': per_page,
-                    'total': 0,
-                    'pages': 0,
+                    'cursor': None,
+                    'next_cursor': None,
                     'has_prev': False,
                     'has_next': False
                 }
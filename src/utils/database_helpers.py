@@ -2,11 +2,40 @@
 Database helper functions for initialization and management
 """
 import logging
+from functools import lru_cache
+from types import SimpleNamespace
 from typing import Dict, Any
 from flask import current_app
 
 logger = logging.getLogger(__name__)
 
+# Rows removed per DELETE statement during cleanup
+CLEANUP_BATCH_SIZE = 1000
+
+# Seconds a successful connectivity ping is reused by the health check
+HEALTH_PING_INTERVAL = 2.0
+_last_ping_ok = 0.0
+
+@lru_cache(maxsize=1)
+def _models() -> SimpleNamespace:
+    """Import the ORM models and security manager on first use, not at import time"""
+    from ..models.user import db, User, Role, roles_users
+    from ..models.session import BrowserSession, SessionStatus
+    from ..models.audit import AuditLog, EventType
+    from ..auth.security import security_manager
+    
+    return SimpleNamespace(
+        db=db,
+        User=User,
+        Role=Role,
+        roles_users=roles_users,
+        BrowserSession=BrowserSession,
+        SessionStatus=SessionStatus,
+        AuditLog=AuditLog,
+        EventType=EventType,
+        security_manager=security_manager
+    )
+
 def init_database(app):
     """
     Initialize database with tables and default data
@@ -14,10 +43,7 @@ def init_database(app):
     Args:
         app: Flask application instance
     """
-    from ..models.user import db, User, Role
-    from ..models.session import BrowserSession
-    from ..models.audit import AuditLog
-    from ..auth.security import security_manager
+    db = _models().db
     
     try:
         with app.app_context():
@@ -25,6 +51,9 @@ def init_database(app):
             db.create_all()
             logger.info("Database tables created successfully")
             
+            # Bring existing databases up to date (indexes and columns create_all skips)
+            upgrade_database_schema()
+            
             # Create default roles
             create_default_roles()
             
@@ -39,7 +68,10 @@ def init_database(app):
 
 def create_default_roles():
     """Create default user roles"""
-    from ..models.user import db, Role
+    from sqlalchemy import select, insert
+    
+    m = _models()
+    db, Role = m.db, m.Role
     
     try:
         default_roles = [
@@ -60,21 +92,22 @@ def create_default_roles():
             }
         ]
         
-        created_roles = []
-        for role_data in default_roles:
-            # Check if role already exists
-            existing_role = Role.query.filter_by(name=role_data['name']).first()
-            
-            if not existing_role:
-                role = Role(**role_data)
-                db.session.add(role)
-                created_roles.append(role_data['name'])
-                logger.info(f"Created role: {role_data['name']}")
-            else:
-                logger.info(f"Role already exists: {role_data['name']}")
+        # Check which roles already exist in a single query
+        existing_roles = set(db.session.execute(
+            select(Role.name).where(Role.name.in_([role_data['name'] for role_data in default_roles]))
+        ).scalars())
+        
+        new_roles = [role_data for role_data in default_roles if role_data['name'] not in existing_roles]
+        created_roles = [role_data['name'] for role_data in new_roles]
+        
+        for name in existing_roles:
+            logger.info(f"Role already exists: {name}")
         
-        if created_roles:
+        if new_roles:
+            db.session.execute(insert(Role), new_roles)
             db.session.commit()
+            for name in created_roles:
+                logger.info(f"Created role: {name}")
             logger.info(f"Created {len(created_roles)} default roles")
         
         return created_roles
@@ -86,20 +119,26 @@ def create_default_roles():
 
 def create_admin_user():
     """Create default admin user if it doesn't exist"""
-    from ..models.user import db, User, Role
-    from ..auth.security import security_manager
+    from sqlalchemy import exists, literal, select
+    
+    m = _models()
+    db, User, Role, security_manager = m.db, m.User, m.Role, m.security_manager
+    roles_users = m.roles_users
     
     try:
         admin_email = current_app.config.get('ADMIN_EMAIL', 'admin@secure-kimi.local')
         admin_password = current_app.config.get('ADMIN_PASSWORD', 'SecureKimi2024!')
         
-        # Check if admin user already exists
-        existing_admin = User.query.filter_by(email=admin_email).first()
+        # Look up the admin user and the admin role in a single round trip
+        ids = db.session.execute(select(
+            select(User.id).where(User.email == admin_email)
+                .scalar_subquery().label('user_id'),
+            select(Role.id).where(Role.name == 'admin')
+                .scalar_subquery().label('role_id')
+        )).one()
         
-        if not existing_admin:
-            # Get admin role
-            admin_role = Role.query.filter_by(name='admin').first()
-            if not admin_role:
+        if ids.user_id is None:
+            if ids.role_id is None:
                 logger.error("Admin role not found. Cannot create admin user.")
                 return
             
@@ -114,22 +153,24 @@ def create_admin_user():
                 confirmed_at=None  # Will be set by SQLAlchemy default
             )
             
-            # Assign admin role
-            admin_user.roles.append(admin_role)
-            
             # Set admin-specific settings
             admin_user.max_containers = 10
             admin_user.container_timeout = 7200  # 2 hours
             
             db.session.add(admin_user)
+            db.session.flush()
+            
+            # Assign admin role with a direct association row
+            db.session.execute(
+                roles_users.insert().values(user_id=admin_user.id, role_id=ids.role_id)
+            )
             db.session.commit()
             
             logger.info(f"Created admin user: {admin_email}")
             
             # Log admin user creation
-            from ..models.audit import AuditLog, EventType
-            AuditLog.log_event(
-                EventType.USER_CREATED,
+            m.AuditLog.log_event(
+                m.EventType.USER_CREATED,
                 user=admin_user,
                 message="System admin user created during initialization"
             )
@@ -137,12 +178,21 @@ def create_admin_user():
         else:
             logger.info(f"Admin user already exists: {admin_email}")
             
-            # Ensure admin has admin role
-            admin_role = Role.query.filter_by(name='admin').first()
-            if admin_role and admin_role not in existing_admin.roles:
-                existing_admin.roles.append(admin_role)
+            # Ensure admin has admin role; the insert is skipped if the row exists
+            if ids.role_id is not None:
+                assignment_exists = exists().where(
+                    roles_users.c.user_id == ids.user_id,
+                    roles_users.c.role_id == ids.role_id
+                )
+                result = db.session.execute(
+                    roles_users.insert().from_select(
+                        ['user_id', 'role_id'],
+                        select(literal(ids.user_id), literal(ids.role_id)).where(~assignment_exists)
+                    )
+                )
                 db.session.commit()
-                logger.info("Added admin role to existing admin user")
+                if result.rowcount:
+                    logger.info("Added admin role to existing admin user")
         
     except Exception as e:
         db.session.rollback()
@@ -151,38 +201,51 @@ def create_admin_user():
 
 def upgrade_database_schema():
     """Upgrade database schema (simple migration system)"""
-    from ..models.user import db
+    from sqlalchemy import text
+    
+    db = _models().db
     
     try:
         # This is a simple migration system
         # In production, use Flask-Migrate or similar
         
-        # Check for schema version table
+        # Reflect tables and columns once; migrations read this snapshot
         inspector = db.inspect(db.engine)
-        tables = inspector.get_table_names()
-        
-        if 'schema_version' not in tables:
-            # Create schema version tracking
-            db.engine.execute("""
-                CREATE TABLE schema_version (
-                    id INTEGER PRIMARY KEY,
-                    version INTEGER NOT NULL,
-                    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            # Insert initial version
-            db.engine.execute("INSERT INTO schema_version (version) VALUES (1)")
+        schema = {
+            table: {column['name'] for column in inspector.get_columns(table)}
+            for table in inspector.get_table_names()
+        }
+        
+        # One parameterized statement shared by every version record
+        insert_version = text("INSERT INTO schema_version (version) VALUES (:v)")
+        
+        if 'schema_version' not in schema:
+            # Create schema version tracking. The version is the key so that
+            # no dialect-specific auto-increment column is needed
+            with db.engine.begin() as conn:
+                conn.exec_driver_sql("""
+                    CREATE TABLE schema_version (
+                        version INTEGER PRIMARY KEY,
+                        applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                """)
+                
+                # Insert initial version
+                conn.execute(insert_version, {"v": 1})
             logger.info("Created schema version tracking")
         
         # Get current schema version
-        result = db.engine.execute("SELECT MAX(version) FROM schema_version").fetchone()
+        with db.engine.connect() as conn:
+            result = conn.exec_driver_sql("SELECT MAX(version) FROM schema_version").fetchone()
         current_version = result[0] if result[0] else 0
         
         # Define migrations
         migrations = {
             2: migrate_to_version_2,
             3: migrate_to_version_3,
+            4: migrate_to_version_4,
+            5: migrate_to_version_5,
+            6: migrate_to_version_6,
             # Add more migrations as needed
         }
         
@@ -190,44 +253,47 @@ def upgrade_database_schema():
         for version, migration_func in migrations.items():
             if version > current_version:
                 logger.info(f"Applying migration to version {version}")
-                migration_func()
-                db.engine.execute(f"INSERT INTO schema_version (version) VALUES ({version})")
+                # Each migration and its version record commit as one transaction
+                with db.engine.begin() as conn:
+                    migration_func(conn, schema)
+                    conn.execute(insert_version, {"v": version})
                 logger.info(f"Migration to version {version} completed")
         
     except Exception as e:
         logger.error(f"Database schema upgrade failed: {e}")
         raise
 
-def migrate_to_version_2():
+def migrate_to_version_2(conn, schema: Dict[str, set]):
     """Example migration to version 2"""
-    from ..models.user import db
-    
     # Example: Add new column to user table
     try:
         # Check if column already exists
-        inspector = db.inspect(db.engine)
-        columns = [col['name'] for col in inspector.get_columns('user')]
+        columns = schema.get('user', set())
         
         if 'avatar_url' not in columns:
-            db.engine.execute("ALTER TABLE user ADD COLUMN avatar_url VARCHAR(255)")
+            conn.exec_driver_sql('ALTER TABLE "user" ADD COLUMN avatar_url VARCHAR(255)')
+            columns.add('avatar_url')
             logger.info("Added avatar_url column to user table")
     
     except Exception as e:
         logger.error(f"Migration to version 2 failed: {e}")
         raise
 
-def migrate_to_version_3():
+def migrate_to_version_3(conn, schema: Dict[str, set]):
     """Example migration to version 3"""
-    from ..models.user import db
-    
     # Example: Add indexes for performance
+    statements = [
+        'CREATE INDEX IF NOT EXISTS idx_user_email ON "user"(email)',
+        'CREATE INDEX IF NOT EXISTS idx_user_username ON "user"(username)',
+        "CREATE INDEX IF NOT EXISTS idx_session_user_id ON browser_session(user_id)",
+        "CREATE INDEX IF NOT EXISTS idx_session_status ON browser_session(status)",
+        "CREATE INDEX IF NOT EXISTS idx_audit_timestamp ON audit_log(timestamp)",
+        "CREATE INDEX IF NOT EXISTS idx_audit_user_id ON audit_log(user_id)"
+    ]
+    
     try:
-        db.engine.execute("CREATE INDEX IF NOT EXISTS idx_user_email ON user(email)")
-        db.engine.execute("CREATE INDEX IF NOT EXISTS idx_user_username ON user(username)")
-        db.engine.execute("CREATE INDEX IF NOT EXISTS idx_session_user_id ON browser_session(user_id)")
-        db.engine.execute("CREATE INDEX IF NOT EXISTS idx_session_status ON browser_session(status)")
-        db.engine.execute("CREATE INDEX IF NOT EXISTS idx_audit_timestamp ON audit_log(timestamp)")
-        db.engine.execute("CREATE INDEX IF NOT EXISTS idx_audit_user_id ON audit_log(user_id)")
+        for statement in statements:
+            conn.exec_driver_sql(statement)
         
         logger.info("Added database indexes for performance")
         
@@ -235,44 +301,119 @@ def migrate_to_version_3():
         logger.error(f"Migration to version 3 failed: {e}")
         raise
 
+def migrate_to_version_4(conn, schema: Dict[str, set]):
+    """Add a trigram index for admin user search (PostgreSQL only)"""
+    from sqlalchemy.exc import DBAPIError
+    
+    try:
+        if conn.dialect.name != 'postgresql':
+            logger.info("Skipping trigram search index: not a PostgreSQL database")
+            return
+        
+        # Creating the extension needs CREATE privilege on the database; run it
+        # in a savepoint so a refusal skips the index without aborting startup
+        try:
+            with conn.begin_nested():
+                conn.exec_driver_sql("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        except DBAPIError as e:
+            logger.warning(
+                f"Skipping trigram search index: could not create pg_trgm ({e}). "
+                "Create the extension and the users_search_trgm index manually"
+            )
+            return
+        
+        conn.exec_driver_sql("""
+            CREATE INDEX IF NOT EXISTS users_search_trgm ON "user" USING gin (
+                (username || ' ' || email || ' ' || coalesce(first_name, '') || ' ' || coalesce(last_name, ''))
+                gin_trgm_ops
+            )
+        """)
+        
+        logger.info("Added trigram index for user search")
+        
+    except Exception as e:
+        logger.error(f"Migration to version 4 failed: {e}")
+        raise
+
+def migrate_to_version_5(conn, schema: Dict[str, set]):
+    """Add the composite session index used by per-user session statistics"""
+    try:
+        conn.exec_driver_sql(
+            "CREATE INDEX IF NOT EXISTS ix_browser_session_user_browser_status "
+            "ON browser_session(user_id, browser_type, status)"
+        )
+        
+        logger.info("Added browser session statistics index")
+        
+    except Exception as e:
+        logger.error(f"Migration to version 5 failed: {e}")
+        raise
+
+def migrate_to_version_6(conn, schema: Dict[str, set]):
+    """Add the keyset index used by cursor pagination of the users listing"""
+    try:
+        conn.exec_driver_sql(
+            'CREATE INDEX IF NOT EXISTS ix_user_created_at_id ON "user"(created_at, id)'
+        )
+        
+        logger.info("Added user listing keyset index")
+        
+    except Exception as e:
+        logger.error(f"Migration to version 6 failed: {e}")
+        raise
+
+def _delete_in_batches(model, *criteria, batch_size: int = CLEANUP_BATCH_SIZE) -> int:
+    """Delete matching rows in primary-key batches, committing after each batch"""
+    from sqlalchemy import delete, select
+    
+    db = _models().db
+    total = 0
+    
+    while True:
+        batch_ids = select(model.id).where(*criteria).limit(batch_size).scalar_subquery()
+        result = db.session.execute(
+            delete(model).where(model.id.in_(batch_ids)).execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+        # The DELETE already reports its rowcount in the same round trip, so no
+        # RETURNING clause is needed to count rows, on PostgreSQL or SQLite
+        total += result.rowcount
+        
+        if result.rowcount < batch_size:
+            return total
+
 def cleanup_database():
     """Clean up old database records"""
-    from ..models.user import db
-    from ..models.session import BrowserSession, SessionStatus
-    from ..models.audit import AuditLog
     from datetime import datetime, timedelta
     
+    m = _models()
+    db, BrowserSession, SessionStatus = m.db, m.BrowserSession, m.SessionStatus
+    AuditLog, EventType = m.AuditLog, m.EventType
+    
     try:
         cleanup_results = {}
         
         # Clean up old stopped sessions (older than 7 days)
         cutoff_date = datetime.utcnow() - timedelta(days=7)
         
-        old_sessions = BrowserSession.query.filter(
+        cleanup_results['old_sessions'] = _delete_in_batches(
+            BrowserSession,
             BrowserSession.stopped_at < cutoff_date,
             BrowserSession.status.in_([SessionStatus.STOPPED, SessionStatus.EXPIRED, SessionStatus.ERROR])
-        ).all()
-        
-        for session in old_sessions:
-            db.session.delete(session)
-        
-        cleanup_results['old_sessions'] = len(old_sessions)
+        )
         
         # Clean up old audit logs (older than 90 days, keep security events)
         audit_cutoff_date = datetime.utcnow() - timedelta(days=90)
         
-        old_audit_logs = AuditLog.query.filter(
+        cleanup_results['old_audit_logs'] = _delete_in_batches(
+            AuditLog,
             AuditLog.timestamp < audit_cutoff_date,
-            AuditLog.event_type.notin_(['login_failed', 'security_violation', 'unauthorized_access'])
-        ).all()
-        
-        for log in old_audit_logs:
-            db.session.delete(log)
-        
-        cleanup_results['old_audit_logs'] = len(old_audit_logs)
-        
-        # Commit all deletions
-        db.session.commit()
+            AuditLog.event_type.notin_([
+                EventType.LOGIN_FAILED,
+                EventType.SECURITY_VIOLATION,
+                EventType.UNAUTHORIZED_ACCESS
+            ])
+        )
         
         logger.info(f"Database cleanup completed: {cleanup_results}")
         return cleanup_results
@@ -282,6 +423,22 @@ def cleanup_database():
         logger.error(f"Database cleanup failed: {e}")
         raise
 
+def _sqlite_copy(source_file: str, target_file: str):
+    """Copy a SQLite database with the online backup API (safe while it is in use)"""
+    import sqlite3
+    from pathlib import Path
+    
+    # Open the source read-only so a missing file raises instead of creating an empty database
+    source_uri = f"{Path(source_file).absolute().as_uri()}?mode=ro"
+    source = sqlite3.connect(source_uri, uri=True)
+    target = sqlite3.connect(target_file)
+    try:
+        with target:
+            source.backup(target, pages=1024)
+    finally:
+        source.close()
+        target.close()
+
 def backup_database(backup_path: str):
     """Create a database backup"""
     import subprocess
@@ -293,18 +450,17 @@ def backup_database(backup_path: str):
         if database_url.startswith('sqlite:///'):
             # SQLite backup
             db_file = database_url.replace('sqlite:///', '')
-            import shutil
-            shutil.copy2(db_file, backup_path)
+            _sqlite_copy(db_file, backup_path)
             logger.info(f"SQLite database backed up to: {backup_path}")
             
         elif database_url.startswith('postgresql://'):
-            # PostgreSQL backup
-            # Extract connection details from URL
-            # This would need proper URL parsing
+            # PostgreSQL backup in directory format, dumping tables in parallel
             subprocess.run([
                 'pg_dump',
-                database_url,
-                '-f', backup_path
+                '-Fd',
+                '-j', str(os.cpu_count() or 4),
+                '-f', backup_path,
+                '-d', database_url
             ], check=True)
             logger.info(f"PostgreSQL database backed up to: {backup_path}")
             
@@ -326,17 +482,26 @@ def restore_database(backup_path: str):
         if database_url.startswith('sqlite:///'):
             # SQLite restore
             db_file = database_url.replace('sqlite:///', '')
-            import shutil
-            shutil.copy2(backup_path, db_file)
+            _sqlite_copy(backup_path, db_file)
             logger.info(f"SQLite database restored from: {backup_path}")
             
         elif database_url.startswith('postgresql://'):
             # PostgreSQL restore
-            subprocess.run([
-                'psql',
-                database_url,
-                '-f', backup_path
-            ], check=True)
+            if os.path.isdir(backup_path):
+                # Directory-format dump from backup_database, restored in parallel
+                subprocess.run([
+                    'pg_restore',
+                    '-j', str(os.cpu_count() or 4),
+                    '-d', database_url,
+                    backup_path
+                ], check=True)
+            else:
+                # Plain SQL dump
+                subprocess.run([
+                    'psql',
+                    database_url,
+                    '-f', backup_path
+                ], check=True)
             logger.info(f"PostgreSQL database restored from: {backup_path}")
             
         else:
@@ -346,11 +511,27 @@ def restore_database(backup_path: str):
         logger.error(f"Database restore failed: {e}")
         raise
 
+def _ping_database(db):
+    """Check connectivity, skipping the round trip if a ping succeeded recently"""
+    import time
+    global _last_ping_ok
+    
+    now = time.monotonic()
+    if now - _last_ping_ok < HEALTH_PING_INTERVAL:
+        return
+    
+    # Stale pooled connections are already replaced by pool_pre_ping
+    with db.engine.connect() as conn:
+        conn.exec_driver_sql('SELECT 1')
+    _last_ping_ok = now
+
 def check_database_health() -> Dict[str, Any]:
     """Check database health and return status"""
-    from ..models.user import db, User
-    from ..models.session import BrowserSession
-    from ..models.audit import AuditLog
+    from sqlalchemy import select, func
+    
+    m = _models()
+    db, User, roles_users = m.db, m.User, m.roles_users
+    BrowserSession, AuditLog = m.BrowserSession, m.AuditLog
     
     health_status = {
         'healthy': True,
@@ -360,32 +541,43 @@ def check_database_health() -> Dict[str, Any]:
     
     try:
         # Test basic connectivity
-        db.session.execute('SELECT 1')
-        
-        # Get table counts
-        health_status['statistics']['users'] = User.query.count()
-        health_status['statistics']['sessions'] = BrowserSession.query.count()
-        health_status['statistics']['audit_logs'] = AuditLog.query.count()
+        _ping_database(db)
+        health_status['statistics']['pool'] = db.engine.pool.status()
+        
+        # Get table counts and integrity checks in a single round trip
+        user_table = User.__table__
+        session_table = BrowserSession.__table__
+        
+        counts = db.session.execute(select(
+            select(func.count()).select_from(user_table)
+                .scalar_subquery().label('users'),
+            select(func.count()).select_from(session_table)
+                .scalar_subquery().label('sessions'),
+            select(func.count()).select_from(AuditLog.__table__)
+                .scalar_subquery().label('audit_logs'),
+            # Sessions whose user no longer exists
+            select(func.count()).select_from(
+                session_table.outerjoin(user_table, session_table.c.user_id == user_table.c.id)
+            ).where(user_table.c.id.is_(None)).scalar_subquery().label('orphaned_sessions'),
+            # Users without any role assignment
+            select(func.count()).select_from(
+                user_table.outerjoin(roles_users, roles_users.c.user_id == user_table.c.id)
+            ).where(roles_users.c.user_id.is_(None)).scalar_subquery().label('users_without_roles')
+        )).one()
+        
+        health_status['statistics']['users'] = counts.users
+        health_status['statistics']['sessions'] = counts.sessions
+        health_status['statistics']['audit_logs'] = counts.audit_logs
         
         # Check for any issues
         
         # Check for orphaned sessions
-        orphaned_sessions = BrowserSession.query.filter(
-            BrowserSession.user_id.notin_(
-                db.session.query(User.id).subquery()
-            )
-        ).count()
-        
-        if orphaned_sessions > 0:
-            health_status['issues'].append(f'{orphaned_sessions} orphaned sessions found')
+        if counts.orphaned_sessions > 0:
+            health_status['issues'].append(f'{counts.orphaned_sessions} orphaned sessions found')
         
         # Check for users without roles
-        users_without_roles = User.query.filter(
-            ~User.roles.any()
-        ).count()
-        
-        if users_without_roles > 0:
-            health_status['issues'].append(f'{users_without_roles} users without roles')
+        if counts.users_without_roles > 0:
+            health_status['issues'].append(f'{counts.users_without_roles} users without roles')
         
         # Set overall health status
         health_status['healthy'] = len(health_status['issues']) == 0
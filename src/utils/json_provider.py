@@ -0,0 +1,58 @@
+"""
+orjson-backed JSON provider for Flask
+"""
+import orjson
+from flask.json.provider import DefaultJSONProvider
+
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider that serializes with orjson instead of the stdlib json module"""
+    
+    # Naive datetimes are treated as UTC and rendered with a trailing Z
+    OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z
+    
+    # API envelopes are small; key sorting and indentation only cost time and bytes
+    sort_keys = False
+    compact = True
+    
+    def _options(self, sort_keys: bool, indent: bool) -> int:
+        """Build orjson option flags for the requested output style"""
+        option = self.OPTIONS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return option
+    
+    def dumps(self, obj, **kwargs) -> str:
+        """
+        Serialize data as JSON
+        
+        Args:
+            obj: Data to serialize
+            **kwargs: sort_keys, indent and default are honored; other
+                json.dumps arguments are ignored
+        
+        Returns:
+            JSON string
+        """
+        option = self._options(
+            kwargs.get('sort_keys', self.sort_keys),
+            bool(kwargs.get('indent'))
+        )
+        # Types orjson does not handle natively (Decimal, objects with
+        # __html__) fall back to Flask's encoder behavior
+        return orjson.dumps(obj, default=kwargs.get('default', self.default), option=option).decode()
+    
+    def loads(self, s, **kwargs):
+        """Deserialize JSON from a string or bytes"""
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        """Serialize the given arguments as JSON and return a response"""
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = self.compact is False or (self.compact is None and self._app.debug)
+        
+        return self._app.response_class(
+            orjson.dumps(obj, default=self.default, option=self._options(self.sort_keys, indent)),
+            mimetype=self.mimetype
+        )
@@ -1,21 +1,51 @@
 """
 Logging configuration for the Cloud Browser Service
 """
+import atexit
+import copy
 import logging
 import logging.handlers
 import os
-from datetime import datetime
+import queue
+import time
+from functools import lru_cache
 from pathlib import Path
-import json
+import orjson
 import sys
 
 class StructuredFormatter(logging.Formatter):
     """Custom formatter for structured logging"""
     
+    # LogRecord attributes that are not user-supplied extra fields
+    RECORD_ATTRIBUTES = frozenset({
+        'name', 'msg', 'args', 'levelname', 'levelno',
+        'pathname', 'filename', 'module', 'lineno',
+        'funcName', 'created', 'msecs', 'relativeCreated',
+        'thread', 'threadName', 'processName', 'process',
+        'exc_info', 'exc_text', 'stack_info', 'message', 'asctime'
+    })
+    TIMESTAMP_FORMAT = '%Y-%m-%dT%H:%M:%S'
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Records arrive many per second; reuse the formatted second. Kept as
+        # one (second, prefix) tuple so handlers on other threads never read
+        # a second paired with a different second's prefix
+        self._cached_timestamp = (None, '')
+    
+    def _format_timestamp(self, created):
+        """Format a record's creation time as a UTC ISO 8601 string"""
+        second = int(created)
+        cached_second, prefix = self._cached_timestamp
+        if second != cached_second:
+            prefix = time.strftime(self.TIMESTAMP_FORMAT, time.gmtime(second))
+            self._cached_timestamp = (second, prefix)
+        return '%s.%06d' % (prefix, int((created - second) * 1000000))
+    
     def format(self, record):
         # Create structured log entry
         log_entry = {
-            'timestamp': datetime.utcnow().isoformat(),
+            'timestamp': self._format_timestamp(record.created),
             'level': record.levelname,
             'logger': record.name,
             'message': record.getMessage(),
@@ -29,16 +59,16 @@ class StructuredFormatter(logging.Formatter):
             log_entry['exception'] = self.formatException(record.exc_info)
         
         # Add extra fields
-        for key, value in record.__dict__.items():
-            if key not in ['name', 'msg', 'args', 'levelname', 'levelno', 
-                          'pathname', 'filename', 'module', 'lineno', 
-                          'funcName', 'created', 'msecs', 'relativeCreated',
-                          'thread', 'threadName', 'processName', 'process',
-                          'exc_info', 'exc_text', 'stack_info']:
-                log_entry['extra'] = log_entry.get('extra', {})
-                log_entry['extra'][key] = value
+        record_attributes = self.RECORD_ATTRIBUTES
+        extra = {
+            key: value for key, value in record.__dict__.items()
+            if key not in record_attributes
+        }
+        if extra:
+            log_entry['extra'] = extra
         
-        return json.dumps(log_entry)
+        # extra= dicts may be keyed by ints, UUIDs or enums, which json.dumps accepted
+        return orjson.dumps(log_entry, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
 
 class ColoredFormatter(logging.Formatter):
     """Colored formatter for console output"""
@@ -52,17 +82,68 @@ class ColoredFormatter(logging.Formatter):
         'CRITICAL': '\033[35m', # Magenta
         'RESET': '\033[0m'      # Reset
     }
+    FORMAT = '{level_color}%(levelname)-8s{reset_color} %(asctime)s [%(name)s:%(lineno)d] %(message)s'
+    DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
     
-    def format(self, record):
-        # Add color to level name
-        level_color = self.COLORS.get(record.levelname, self.COLORS['RESET'])
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Build one formatter per level up front; unknown levels use no color
         reset_color = self.COLORS['RESET']
+        self._by_level = {
+            level: self._make_formatter(color, reset_color)
+            for level, color in self.COLORS.items() if level != 'RESET'
+        }
+        self._default = self._make_formatter(reset_color, reset_color)
+    
+    def _make_formatter(self, level_color, reset_color):
+        """Create a formatter that colors the level name"""
+        colored_format = self.FORMAT.format(level_color=level_color, reset_color=reset_color)
+        return logging.Formatter(colored_format, datefmt=self.DATE_FORMAT)
+    
+    def format(self, record):
+        return self._by_level.get(record.levelname, self._default).format(record)
+
+class _LocalQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler for an in-process listener that keeps records intact"""
+    
+    def prepare(self, record):
+        # Resolve the message on the calling thread but keep exc_info and
+        # extra fields so the listener's formatter still sees them
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+def _start_queue_listener(app, *handlers):
+    """
+    Move handlers onto a background listener thread
+    
+    Args:
+        app: Flask application instance
+        *handlers: Handlers the listener should write to
         
-        # Create colored format string
-        colored_format = f'{level_color}%(levelname)-8s{reset_color} %(asctime)s [%(name)s:%(lineno)d] %(message)s'
-        
-        formatter = logging.Formatter(colored_format, datefmt='%Y-%m-%d %H:%M:%S')
-        return formatter.format(record)
+    Returns:
+        Queue handler that forwards records to the listener
+    """
+    log_queue = queue.Queue(-1)
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    
+    if 'log_listeners' not in app.extensions:
+        app.extensions['log_listeners'] = []
+        atexit.register(stop_log_listeners, app)
+    app.extensions['log_listeners'].append(listener)
+    return _LocalQueueHandler(log_queue)
+
+def stop_log_listeners(app):
+    """
+    Flush queued log records and stop the listener threads
+    
+    Args:
+        app: Flask application instance
+    """
+    for listener in app.extensions.pop('log_listeners', []):
+        listener.stop()
 
 def setup_logging(app):
     """
@@ -101,36 +182,40 @@ def setup_logging(app):
     file_handler = logging.handlers.RotatingFileHandler(
         all_logs_file,
         maxBytes=10 * 1024 * 1024,  # 10MB
-        backupCount=5
+        backupCount=5,
+        delay=True  # Open the file on first write
     )
     file_handler.setFormatter(StructuredFormatter())
     file_handler.setLevel(logging.DEBUG)
-    logging.root.addHandler(file_handler)
     
     # Error file handler for errors and above
     error_logs_file = log_dir / 'error.log'
     error_handler = logging.handlers.RotatingFileHandler(
         error_logs_file,
         maxBytes=10 * 1024 * 1024,  # 10MB
-        backupCount=5
+        backupCount=5,
+        delay=True  # Open the file on first write
     )
     error_handler.setFormatter(StructuredFormatter())
     error_handler.setLevel(logging.ERROR)
-    logging.root.addHandler(error_handler)
+    
+    # File writes happen on a listener thread, not the request thread
+    logging.root.addHandler(_start_queue_listener(app, file_handler, error_handler))
     
     # Security audit log handler
     security_logs_file = log_dir / 'security.log'
     security_handler = logging.handlers.RotatingFileHandler(
         security_logs_file,
         maxBytes=10 * 1024 * 1024,  # 10MB
-        backupCount=10  # Keep more security logs
+        backupCount=10,  # Keep more security logs
+        delay=True  # Open the file on first write
     )
     security_handler.setFormatter(StructuredFormatter())
     security_handler.setLevel(logging.INFO)
     
     # Create security logger
     security_logger = logging.getLogger('security')
-    security_logger.addHandler(security_handler)
+    security_logger.addHandler(_start_queue_listener(app, security_handler))
     security_logger.setLevel(logging.INFO)
     security_logger.propagate = False
     
@@ -139,14 +224,15 @@ def setup_logging(app):
     access_handler = logging.handlers.RotatingFileHandler(
         access_logs_file,
         maxBytes=10 * 1024 * 1024,  # 10MB
-        backupCount=5
+        backupCount=5,
+        delay=True  # Open the file on first write
     )
     access_handler.setFormatter(StructuredFormatter())
     access_handler.setLevel(logging.INFO)
     
     # Create access logger
     access_logger = logging.getLogger('access')
-    access_logger.addHandler(access_handler)
+    access_logger.addHandler(_start_queue_listener(app, access_handler))
     access_logger.setLevel(logging.INFO)
     access_logger.propagate = False
     
@@ -217,6 +303,7 @@ def configure_third_party_loggers():
     urllib3_logger = logging.getLogger('urllib3')
     urllib3_logger.setLevel(logging.WARNING)
 
+@lru_cache(maxsize=256)
 def get_logger(name):
     """
     Get a logger with the application namespace
@@ -229,6 +316,10 @@ def get_logger(name):
     """
     return logging.getLogger(f'cloud_browser.{name}')
 
+# Loggers used on the request path, looked up once
+_ACCESS_LOGGER = logging.getLogger('access')
+_SECURITY_LOGGER = logging.getLogger('security')
+
 def log_request(request, response, duration_ms=None):
     """
     Log HTTP request details
@@ -238,7 +329,8 @@ def log_request(request, response, duration_ms=None):
         response: Flask response object
         duration_ms: Request duration in milliseconds
     """
-    access_logger = logging.getLogger('access')
+    if not _ACCESS_LOGGER.isEnabledFor(logging.INFO):
+        return
     
     log_data = {
         'method': request.method,
@@ -259,7 +351,7 @@ def log_request(request, response, duration_ms=None):
         log_data['user_id'] = g.current_user.id
         log_data['username'] = g.current_user.username
     
-    access_logger.info('HTTP Request', extra=log_data)
+    _ACCESS_LOGGER.info('HTTP Request', extra=log_data)
 
 def log_security_event(event_type, user_id=None, ip_address=None, details=None):
     """
@@ -271,7 +363,8 @@ def log_security_event(event_type, user_id=None, ip_address=None, details=None):
         ip_address: Client IP address
         details: Additional event details
     """
-    security_logger = logging.getLogger('security')
+    if not _SECURITY_LOGGER.isEnabledFor(logging.WARNING):
+        return
     
     log_data = {
         'event_type': event_type,
@@ -280,7 +373,7 @@ def log_security_event(event_type, user_id=None, ip_address=None, details=None):
         'details': details or {}
     }
     
-    security_logger.warning(f'Security Event: {event_type}', extra=log_data)
+    _SECURITY_LOGGER.warning(f'Security Event: {event_type}', extra=log_data)
 
 # Context manager for timed operations
 class LoggedOperation:
@@ -292,12 +385,15 @@ class LoggedOperation:
         self.start_time = None
     
     def __enter__(self):
-        self.start_time = datetime.utcnow()
-        self.logger.info(f'Starting operation: {self.operation_name}')
+        self.start_time = time.perf_counter()
+        self.logger.info('Starting operation: %s', self.operation_name)
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
-        duration = (datetime.utcnow() - self.start_time).total_seconds() * 1000
+        if not self.logger.isEnabledFor(logging.INFO if exc_type is None else logging.ERROR):
+            return
+        
+        duration = (time.perf_counter() - self.start_time) * 1000
         
         if exc_type is None:
             self.logger.info(
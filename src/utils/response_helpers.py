@@ -1,12 +1,119 @@
 """
 Response helper functions for consistent API responses
 """
-from flask import jsonify
+from flask import Response, has_request_context, request
+from dataclasses import dataclass
+from functools import lru_cache
+from http import HTTPStatus
 from typing import Any, Dict, Optional, Union
-from datetime import datetime
+from datetime import datetime, timezone
+import hashlib
+import time
+import orjson
+
+from .json_provider import OrjsonProvider
+
+# Hot-path callables and settings bound once at import
+_dumps = orjson.dumps
+_time_ns = time.time_ns
+_JSON_DEFAULT = OrjsonProvider.default
+_JSON_OPTIONS = OrjsonProvider.OPTIONS
+
+# (epoch second, formatted date and time up to the second); replaced as a
+# whole so concurrent threads never see a second paired with another's prefix
+_ts_cache = (0, '')
+
+def _now_iso() -> str:
+    """Current UTC time as an ISO 8601 string with milliseconds and a Z suffix"""
+    global _ts_cache
+    now_ns = _time_ns()
+    now, remainder_ns = divmod(now_ns, 1_000_000_000)
+    cached_second, prefix = _ts_cache
+    if cached_second != now:
+        # Only the seconds prefix goes through datetime, once per second
+        prefix = datetime.fromtimestamp(now, tz=timezone.utc).strftime('%Y-%m-%dT%H:%M:%S')
+        _ts_cache = (now, prefix)
+    return '%s.%03dZ' % (prefix, remainder_ns // 1_000_000)
+
+@dataclass(slots=True)
+class _SuccessEnvelope:
+    """Success envelope with metadata but no data (fields in wire order)"""
+    success: bool
+    message: str
+    timestamp: str
+    meta: Dict[str, Any]
+
+@dataclass(slots=True)
+class _ErrorEnvelope:
+    """Error envelope with metadata (fields in wire order)"""
+    success: bool
+    error: Dict[str, Any]
+    timestamp: str
+    meta: Dict[str, Any]
+
+def _json_response(payload: Any, status: int) -> Response:
+    """Serialize a response envelope straight into a JSON response"""
+    return Response(
+        _dumps(payload, default=_JSON_DEFAULT, option=_JSON_OPTIONS),
+        status=status,
+        mimetype='application/json'
+    )
+
+# Pre-encoded pieces of the fixed envelope shapes (keys in the same order as the dict path)
+_SUCCESS_HEAD = b'{"success":true,"message":'
+_ERROR_HEAD = b'{"success":false,"error":{"code":'
+_ERROR_MESSAGE = b',"message":'
+_ERROR_DETAILS = b',"details":'
+_TIMESTAMP_HEAD = b',"timestamp":"'
+_TIMESTAMP_TAIL = b'"}'
+_DATA_HEAD = b'","data":'
+_ITEMS_HEAD = _DATA_HEAD + b'{"items":['
+_PAGINATION_HEAD = b'],"pagination":'
+_META_HEAD = b',"meta":'
+
+_VALIDATION_ERROR_HEAD = (
+    b'{"success":false,"error":{"code":"validation_failed",'
+    b'"message":"Request validation failed","details":'
+)
+_VALIDATION_ERROR_TAIL = b'}' + _TIMESTAMP_HEAD
+
+# Items encoded per chunk when streaming a paginated response
+PAGINATION_CHUNK_SIZE = 500
+
+@lru_cache(maxsize=256)
+def _error_head(error_code: str, message: str, details_json: bytes = b'') -> bytes:
+    """Encode the constant part of an error envelope; repeated errors reuse the bytes"""
+    head = _ERROR_HEAD + _dumps(error_code) + _ERROR_MESSAGE + _dumps(message)
+    if details_json:
+        head += _ERROR_DETAILS + details_json
+    return head + b'}'
+
+# Fixed error helpers: kind -> (error code, message template)
+_ERROR_TEMPLATES = {
+    'not_found': ('not_found', '{} not found'),
+    'unauthorized': ('unauthorized', '{}'),
+    'forbidden': ('forbidden', '{}'),
+    'rate_limit': ('rate_limit_exceeded', 'Rate limit exceeded: {}'),
+    'service_unavailable': ('service_unavailable', '{} is temporarily unavailable'),
+    'internal_error': ('internal_server_error', '{}')
+}
+
+@lru_cache(maxsize=64)
+def _template_error_head(kind: str, value: str) -> bytes:
+    """Encode the constant part of a fixed helper's error envelope"""
+    error_code, template = _ERROR_TEMPLATES[kind]
+    return _error_head(error_code, template.format(value))
+
+def _stamped_response(head: bytes, status: int) -> Response:
+    """Close a pre-encoded envelope with the current timestamp"""
+    return Response(
+        head + _TIMESTAMP_HEAD + _now_iso().encode() + _TIMESTAMP_TAIL,
+        status=status,
+        mimetype='application/json'
+    )
 
 def success_response(message: str, data: Optional[Dict[str, Any]] = None, 
-                    meta: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+                    meta: Optional[Dict[str, Any]] = None, status: int = HTTPStatus.OK) -> Dict[str, Any]:
     """
     Create a standardized success response
     
@@ -14,27 +121,45 @@ def success_response(message: str, data: Optional[Dict[str, Any]] = None,
         message: Success message
         data: Response data (optional)
         meta: Metadata (optional)
+        status: HTTP status code
         
     Returns:
         Standardized success response dictionary
     """
-    response = {
-        'success': True,
-        'message': message,
-        'timestamp': datetime.utcnow().isoformat()
-    }
+    if data is None and meta is None:
+        # Common case: only the message varies
+        return _stamped_response(_SUCCESS_HEAD + _dumps(message), status)
     
-    if data is not None:
-        response['data'] = data
+    if data is None:
+        return _json_response(_SuccessEnvelope(True, message, _now_iso(), meta), status)
     
+    message_json = _dumps(message)
+    tail = _DATA_HEAD + _dumps(data, default=_JSON_DEFAULT, option=_JSON_OPTIONS)
     if meta is not None:
-        response['meta'] = meta
+        tail += _META_HEAD + _dumps(meta, default=_JSON_DEFAULT, option=_JSON_OPTIONS)
+    tail += b'}'
+    
+    # Reads are tagged by everything but the timestamp so unchanged responses can be answered with 304
+    etag = None
+    if status == HTTPStatus.OK and has_request_context() and request.method in ('GET', 'HEAD'):
+        etag = hashlib.blake2b(message_json + tail, digest_size=16).hexdigest()
+        if request.if_none_match.contains(etag):
+            response = Response(status=HTTPStatus.NOT_MODIFIED)
+            response.set_etag(etag)
+            return response
     
-    return jsonify(response)
+    response = Response(
+        _SUCCESS_HEAD + message_json + _TIMESTAMP_HEAD + _now_iso().encode() + tail,
+        status=status,
+        mimetype='application/json'
+    )
+    if etag is not None:
+        response.set_etag(etag)
+    return response
 
 def error_response(error_code: str, message: str, 
                   details: Optional[Union[str, Dict[str, Any]]] = None,
-                  meta: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+                  meta: Optional[Dict[str, Any]] = None, status: int = HTTPStatus.OK) -> Dict[str, Any]:
     """
     Create a standardized error response
     
@@ -43,29 +168,29 @@ def error_response(error_code: str, message: str,
         message: Error message
         details: Error details (optional)
         meta: Metadata (optional)
+        status: HTTP status code
         
     Returns:
         Standardized error response dictionary
     """
-    response = {
-        'success': False,
-        'error': {
-            'code': error_code,
-            'message': message
-        },
-        'timestamp': datetime.utcnow().isoformat()
-    }
+    if meta is None:
+        # Common case: everything but the timestamp repeats across calls; details
+        # are keyed by their encoding since dicts are not hashable
+        if details is None:
+            return _stamped_response(_error_head(error_code, message), status)
+        details_json = _dumps(details, default=_JSON_DEFAULT, option=_JSON_OPTIONS)
+        return _stamped_response(_error_head(error_code, message, details_json), status)
     
-    if details is not None:
-        response['error']['details'] = details
+    # Build the envelope as a single literal for each remaining shape
+    if details is None:
+        error = {'code': error_code, 'message': message}
+    else:
+        error = {'code': error_code, 'message': message, 'details': details}
     
-    if meta is not None:
-        response['meta'] = meta
-    
-    return jsonify(response)
+    return _json_response(_ErrorEnvelope(False, error, _now_iso(), meta), status)
 
 def paginated_response(message: str, items: list, pagination: Dict[str, Any],
-                      meta: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+                      meta: Optional[Dict[str, Any]] = None, status: int = HTTPStatus.OK) -> Dict[str, Any]:
     """
     Create a standardized paginated response
     
@@ -74,150 +199,127 @@ def paginated_response(message: str, items: list, pagination: Dict[str, Any],
         items: List of items for current page
         pagination: Pagination information
         meta: Additional metadata (optional)
+        status: HTTP status code
         
     Returns:
         Standardized paginated response dictionary
     """
-    data = {
-        'items': items,
-        'pagination': pagination
-    }
+    # Encode the small parts up front so serialization errors surface before streaming
+    head = _SUCCESS_HEAD + _dumps(message) + _TIMESTAMP_HEAD + _now_iso().encode() + _ITEMS_HEAD
+    tail = _PAGINATION_HEAD + _dumps(pagination, default=_JSON_DEFAULT, option=_JSON_OPTIONS) + b'}'
+    if meta is not None:
+        tail += _META_HEAD + _dumps(meta, default=_JSON_DEFAULT, option=_JSON_OPTIONS)
+    tail += b'}'
+    
+    def generate():
+        yield head
+        # Items are encoded a chunk at a time, so the full body never sits in memory
+        for start in range(0, len(items), PAGINATION_CHUNK_SIZE):
+            chunk = _dumps(items[start:start + PAGINATION_CHUNK_SIZE], default=_JSON_DEFAULT, option=_JSON_OPTIONS)
+            if start:
+                yield b','
+            yield chunk[1:-1]
+        yield tail
     
-    return success_response(message, data, meta)
+    return Response(generate(), status=status, mimetype='application/json')
 
-def validation_error_response(validation_errors: Dict[str, list]) -> Dict[str, Any]:
+def validation_error_response(validation_errors: Dict[str, list], status: int = HTTPStatus.BAD_REQUEST) -> Dict[str, Any]:
     """
     Create a standardized validation error response
     
     Args:
         validation_errors: Dictionary of field validation errors
+        status: HTTP status code
         
     Returns:
         Standardized validation error response dictionary
     """
-    return error_response(
-        'validation_failed',
-        'Request validation failed',
-        validation_errors
+    # Only the field errors and the timestamp vary
+    return Response(
+        _VALIDATION_ERROR_HEAD
+        + _dumps(validation_errors, default=_JSON_DEFAULT, option=_JSON_OPTIONS)
+        + _VALIDATION_ERROR_TAIL + _now_iso().encode() + _TIMESTAMP_TAIL,
+        status=status,
+        mimetype='application/json'
     )
 
-def not_found_response(resource_type: str = 'Resource') -> Dict[str, Any]:
+def not_found_response(resource_type: str = 'Resource', status: int = HTTPStatus.NOT_FOUND) -> Dict[str, Any]:
     """
     Create a standardized not found response
     
     Args:
         resource_type: Type of resource that was not found
+        status: HTTP status code
         
     Returns:
         Standardized not found response dictionary
     """
-    return error_response(
-        'not_found',
-        f'{resource_type} not found'
-    )
+    return _stamped_response(_template_error_head('not_found', resource_type), status)
 
-def unauthorized_response(message: str = 'Authentication required') -> Dict[str, Any]:
+def unauthorized_response(message: str = 'Authentication required', status: int = HTTPStatus.UNAUTHORIZED) -> Dict[str, Any]:
     """
     Create a standardized unauthorized response
     
     Args:
         message: Unauthorized message
+        status: HTTP status code
         
     Returns:
         Standardized unauthorized response dictionary
     """
-    return error_response(
-        'unauthorized',
-        message
-    )
+    return _stamped_response(_template_error_head('unauthorized', message), status)
 
-def forbidden_response(message: str = 'Access denied') -> Dict[str, Any]:
+def forbidden_response(message: str = 'Access denied', status: int = HTTPStatus.FORBIDDEN) -> Dict[str, Any]:
     """
     Create a standardized forbidden response
     
     Args:
         message: Forbidden message
+        status: HTTP status code
         
     Returns:
         Standardized forbidden response dictionary
     """
-    return error_response(
-        'forbidden',
-        message
-    )
+    return _stamped_response(_template_error_head('forbidden', message), status)
 
-def rate_limit_response(limit: str = 'Rate limit exceeded') -> Dict[str, Any]:
+def rate_limit_response(limit: str = 'Rate limit exceeded', status: int = HTTPStatus.TOO_MANY_REQUESTS) -> Dict[str, Any]:
     """
     Create a standardized rate limit response
     
     Args:
         limit: Rate limit information
+        status: HTTP status code
         
     Returns:
         Standardized rate limit response dictionary
     """
-    return error_response(
-        'rate_limit_exceeded',
-        f'Rate limit exceeded: {limit}'
-    )
+    return _stamped_response(_template_error_head('rate_limit', limit), status)
 
-def service_unavailable_response(service: str = 'Service') -> Dict[str, Any]:
+def service_unavailable_response(service: str = 'Service', status: int = HTTPStatus.SERVICE_UNAVAILABLE) -> Dict[str, Any]:
     """
     Create a standardized service unavailable response
     
     Args:
         service: Name of the unavailable service
+        status: HTTP status code
         
     Returns:
         Standardized service unavailable response dictionary
     """
-    return error_response(
-        'service_unavailable',
-        f'{service} is temporarily unavailable'
-    )
+    return _stamped_response(_template_error_head('service_unavailable', service), status)
 
-def internal_error_response(message: str = 'Internal server error') -> Dict[str, Any]:
+def internal_error_response(message: str = 'Internal server error', status: int = HTTPStatus.INTERNAL_SERVER_ERROR) -> Dict[str, Any]:
     """
     Create a standardized internal server error response
     
     Args:
         message: Error message
+        status: HTTP status code
         
     Returns:
         Standardized internal error response dictionary
     """
-    return error_response(
-        'internal_server_error',
-        message
-    )
-
-def create_response_with_status(response_func, status_code: int):
-    """
-    Create a response with a specific status code
-    
-    Args:
-        response_func: Response function to call
-        status_code: HTTP status code
-        
-    Returns:
-        Tuple of (response, status_code)
-    """
-    response = response_func()
-    return response, status_code
-
-# Common HTTP status codes for convenience
-HTTP_200_OK = 200
-HTTP_201_CREATED = 201
-HTTP_400_BAD_REQUEST = 400
-HTTP_401_UNAUTHORIZED = 401
-HTTP_403_FORBIDDEN = 403
-HTTP_404_NOT_FOUND = 404
-HTTP_409_CONFLICT = 409
-HTTP_410_GONE = 410
-HTTP_422_UNPROCESSABLE_ENTITY = 422
-HTTP_429_TOO_MANY_REQUESTS = 429
-HTTP_500_INTERNAL_SERVER_ERROR = 500
-HTTP_503_SERVICE_UNAVAILABLE = 503
+    return _stamped_response(_template_error_head('internal_error', message), status)
 
 # Response format examples for documentation
 RESPONSE_EXAMPLES = {